@@ -0,0 +1,256 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import math
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dataset import EncodedDataset, log_usefulness
+from counts import CountTable
+from codegen import SpecializedFold
+
+class FoldModel:
+    """
+    Naive Bayes tables of one CV fold over *all* attributes.
+
+    The tables of any attribute subset are slices of these, so a fold is
+    prepared once and then shared by every mask scored against it. Scores are
+    accumulated in the same order as Classifier.apply_classifier (prior,
+    usefulness, then attributes ascending), hence the hF values are identical.
+    Duplicate rows are collapsed: training counts add their weights and each
+    validation prediction contributes weight times its hP/hR terms. As those
+    terms are integers, the totals (and hF) do not change. `train_counts`
+    may supply the training statistics directly, e.g. as a difference of
+    count tables.
+    """
+
+    def __init__(self, dataset: EncodedDataset, train_rows: Sequence[int],
+                 valid_rows: Sequence[int], usf: bool, train_counts: Optional[CountTable] = None):
+        self.dataset = dataset
+        n_feats = dataset.n_feats
+        n_eval = len(dataset.eval_classes)
+        attr_idx = dataset.attribute_index
+        values = dataset.values
+        row_label = dataset.row_label
+
+        if train_counts is None:
+            train_counts = CountTable.from_rows(dataset, train_rows)
+        class_freq, counts = train_counts.class_counts(dataset.eval_classes)
+
+        n_train = train_counts.n_rows
+        smoothing = math.log10(1 / n_train) if n_train > 0 else float('-inf')
+        lu = log_usefulness(dataset) if usf else None
+        # classes never seen in training have a -inf prior and can never win
+        self.classes: List[int] = []
+        self.base: List[float] = []
+        self.tables: List[List[float]] = []
+        for e in range(n_eval):
+            cfreq = class_freq[e]
+            if cfreq == 0:
+                continue
+            score = math.log10(cfreq / n_train)
+            if lu is not None:
+                score += lu[e]
+            self.classes.append(e)
+            self.base.append(score)
+            self.tables.append([math.log10(c / cfreq) if c > 0 else smoothing for c in counts[e]])
+
+        unique, self.valid_weights = dataset.collapse(valid_rows)
+        self.valid_slots = [[attr_idx[a] + values[r * n_feats + a] for a in range(n_feats)]
+                            for r in unique]
+        self.valid_labels = [row_label[r] for r in unique]
+
+    def score(self, selected: Sequence[int], collapse: bool = False) -> float:
+        """
+        hF of the attribute subset `selected` (ascending attribute ids) on this
+        fold. With `collapse`, validation rows that coincide on the selected
+        attributes are classified once.
+        """
+        ds = self.dataset
+        label_inter = ds.label_inter
+        label_depth = ds.label_depth
+        eval_depth = ds.eval_depth
+        classes, base, tables = self.classes, self.base, self.tables
+        n_cls = len(classes)
+
+        rows = zip(self.valid_slots, self.valid_labels, self.valid_weights)
+        if collapse:
+            projected: Dict[tuple, list] = {}
+            for slots, lbl, w in rows:
+                projected.setdefault(tuple([slots[a] for a in selected]), []).append((lbl, w))
+            groups = projected.items()
+        else:
+            groups = (([slots[a] for a in selected], ((lbl, w),)) for slots, lbl, w in rows)
+
+        numerator = sumP = sumT = 0
+        for offs, members in groups:
+            best_score = float('-inf')
+            best = -1
+            for k in range(n_cls):
+                score = base[k]
+                lt = tables[k]
+                for s in offs:
+                    score += lt[s]
+                if score > best_score:
+                    best_score = score
+                    best = k
+            for lbl, w in members:
+                if best >= 0:
+                    e = classes[best]
+                    numerator += w * label_inter[lbl][e]
+                    sumP += w * eval_depth[e]
+                else:
+                    sumP += w  # empty prediction counts as one unmatched level
+                sumT += w * label_depth[lbl]
+
+        hP = numerator / sumP if sumP > 0 else 0.0
+        hR = numerator / sumT if sumT > 0 else 0.0
+        if (hP + hR) == 0:
+            return 0.0
+        return 100 * (2 * hP * hR) / (hP + hR)
+
+class BatchEvaluator:
+    """
+    Worker-side evaluator of mask batches. Fold models are built lazily on
+    first use and kept for the lifetime of the worker, so every batch after
+    the first only pays for the per-mask scoring. Delegates to the native
+    kernel when one is given. `collapse` is passed on to FoldModel.score();
+    otherwise `specialize` scores through per-mask generated code (codegen).
+    """
+
+    def __init__(self, dataset: EncodedDataset, folds, usf: bool, scorer=None,
+                 collapse: bool = False, specialize: bool = False):
+        self.dataset = dataset
+        self.folds = folds
+        self.usf = usf
+        self.scorer = scorer
+        self.collapse = collapse
+        self.specialize = specialize and not collapse
+        self._models: Dict[int, FoldModel] = {}
+        self._special: Dict[int, SpecializedFold] = {}
+        self._total: Optional[CountTable] = None
+
+    def total_counts(self) -> CountTable:
+        """Counts of every row, ending at the dataset's data_end so count_appended() can extend them."""
+        if self._total is None:
+            self._total = CountTable.from_rows(self.dataset, range(self.dataset.n_rows),
+                                               self.dataset.data_end)
+        return self._total
+
+    def fold_model(self, fid: int) -> FoldModel:
+        model = self._models.get(fid)
+        if model is None:
+            train_idx, valid_idx = self.folds[fid]
+            counts = None
+            if len(train_idx) + len(valid_idx) == self.dataset.n_rows:
+                # complementary folds: count all rows once, then drop each validation fold
+                counts = self.total_counts() - CountTable.from_rows(self.dataset, valid_idx)
+            model = FoldModel(self.dataset, train_idx, valid_idx, self.usf, counts)
+            self._models[fid] = model
+        return model
+
+    def fold_scorer(self, fid: int):
+        """Callable scoring a list of selected attribute ids on fold `fid`."""
+        if not self.specialize:
+            model = self.fold_model(fid)
+            return lambda sel: model.score(sel, self.collapse)
+        special = self._special.get(fid)
+        if special is None:
+            special = self._special[fid] = SpecializedFold(self.fold_model(fid))
+        return special.score
+
+    def evaluate(self, masks: Sequence[Sequence[bool]]) -> List[float]:
+        """Mean hF over the folds for every mask, like evaluate_mask()."""
+        if self.scorer is not None:
+            return self.scorer.score(masks)
+        selections = [[a for a, keep in enumerate(mask) if keep] for mask in masks]
+        # fold-major: each fold's tables stay hot while the whole batch is scored
+        per_mask: List[List[float]] = [[] for _ in masks]
+        for fid in range(len(self.folds)):
+            score = self.fold_scorer(fid)
+            for m, sel in enumerate(selections):
+                per_mask[m].append(score(sel))
+        return [sum(fold_scores) / len(fold_scores) for fold_scores in per_mask]
+
+    def evaluate_units(self, units: Sequence[Tuple[int, Sequence[bool]]]) -> List[float]:
+        """hF of every (fold id, mask) unit; units of the same fold are scored together."""
+        by_fold: Dict[int, List[int]] = {}
+        for u, (fid, _) in enumerate(units):
+            by_fold.setdefault(fid, []).append(u)
+        out = [0.0] * len(units)
+        for fid, members in by_fold.items():
+            masks = [units[u][1] for u in members]
+            if self.scorer is not None:
+                vals = self.scorer.fold_score(masks, fid)
+            else:
+                score = self.fold_scorer(fid)
+                vals = [score([a for a, keep in enumerate(m) if keep]) for m in masks]
+            for u, v in zip(members, vals):
+                out[u] = v
+        return out
+
+def mask_cost(mask: Sequence[bool]) -> int:
+    """Relative cost of scoring a mask: one unit per selected attribute plus the prior."""
+    return sum(1 for keep in mask if keep) + 1
+
+def lpt_batches(costs: Sequence[float], n_batches: int) -> List[List[int]]:
+    """
+    Longest-processing-time-first assignment of items to `n_batches` bins.
+    Returns the item indices of every non-empty bin, heaviest bin first.
+    """
+    n_batches = max(1, min(n_batches, len(costs)))
+    heap = [(0.0, b) for b in range(n_batches)]
+    bins: List[List[int]] = [[] for _ in range(n_batches)]
+    for i in sorted(range(len(costs)), key=lambda i: -costs[i]):
+        load, b = heapq.heappop(heap)
+        bins[b].append(i)
+        heapq.heappush(heap, (load + costs[i], b))
+    loads = {b: load for load, b in heap}
+    return [bins[b] for b in sorted(range(n_batches), key=lambda b: -loads[b]) if bins[b]]
+
+class BatchTuner:
+    """
+    Chooses how many batches a population is split into, as `workers * k`
+    with k a power of two. Small k means less IPC, large k better load
+    balance; the tuner measures evaluations/second for each k it tries, walks
+    towards the faster neighbour and re-measures the others now and then.
+    """
+
+    def __init__(self, workers: int, max_factor: int = 16, revisit: int = 10):
+        self.workers = max(1, workers)
+        self.max_factor = max_factor
+        self.revisit = revisit
+        self.factor = 1
+        self.throughput: Dict[int, float] = {}
+        self._rounds = 0
+
+    def n_batches(self, n_items: int) -> int:
+        return max(1, min(n_items, self.workers * self.factor))
+
+    def observe(self, n_items: int, seconds: float):
+        if n_items <= 0 or seconds <= 0:
+            return
+        rate = n_items / seconds
+        old = self.throughput.get(self.factor)
+        self.throughput[self.factor] = rate if old is None else 0.5 * (old + rate)
+        self._rounds += 1
+        if self._rounds % self.revisit == 0:
+            self.throughput = {self.factor: self.throughput[self.factor]}
+
+        up, down = self.factor * 2, self.factor // 2
+        if up <= self.max_factor and up not in self.throughput:
+            self.factor = up
+        elif down >= 1 and down not in self.throughput:
+            self.factor = down
+        else:
+            self.factor = max(self.throughput, key=lambda k: self.throughput[k])
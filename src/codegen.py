@@ -0,0 +1,197 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import time
+import random
+import platform
+from argparse import ArgumentParser
+from typing import Callable, Dict, Sequence, Tuple
+
+# (number of classes, selected attribute ids) -> compiled factory, shared by every fold model
+_FACTORIES: Dict[Tuple[int, ...], Callable] = {}
+# characters of generated source kept compiled (compiled code is a few times larger)
+CACHE_BUDGET = 16 << 20
+# scorers kept per fold
+MAX_CACHED = 4096
+_cached_size = 0
+# bumped whenever the factory cache is dropped, so folds drop their scorers too
+_generation = 0
+# above this many table reads per row the class loop is kept instead of unrolled
+UNROLL_LIMIT = 4096
+# terms per generated sum: longer chains overflow CPython's compiler recursion
+CHUNK = 256
+
+_TAIL = (
+    "        hP = numerator / sumP if sumP > 0 else 0.0\n"
+    "        hR = numerator / sumT if sumT > 0 else 0.0\n"
+    "        if (hP + hR) == 0:\n"
+    "            return 0.0\n"
+    "        return 100 * (2 * hP * hR) / (hP + hR)\n"
+    "    return score\n"
+)
+
+def _sum_statements(indent: str, target: str, first: str, terms: Sequence[str]) -> str:
+    """`target = first + terms...` as statements of at most CHUNK terms, still added left to right."""
+    chunks = [terms[i : i + CHUNK] for i in range(0, len(terms), CHUNK)] or [[]]
+    out = f"{indent}{target} = {first}{''.join(' + ' + t for t in chunks[0])}\n"
+    for chunk in chunks[1:]:
+        out += f"{indent}{target} = {target}{''.join(' + ' + t for t in chunk)}\n"
+    return out
+
+def scorer_source(selected: Sequence[int], n_classes: int) -> str:
+    """
+    Source of a factory that binds one fold's tables and returns the hF
+    scorer of `selected`. Attribute offsets are constants and every table
+    read is spelled out; with few enough classes the class loop is unrolled
+    too, otherwise classes index one flat table. Reads are added left to
+    right after the prior, as in FoldModel.score(), so results are identical.
+    """
+    head = (
+        "def factory(rows, base, tables, flat, offsets, classes, label_inter, eval_depth, label_depth):\n"
+    )
+    loads = ''.join(f"            s{i} = slots[{a}]\n" for i, a in enumerate(selected))
+    accumulate = (
+        "            numerator += w * label_inter[lbl][e]\n"
+        "            sumP += w * eval_depth[e]\n"
+        "            sumT += w * label_depth[lbl]\n"
+    )
+    if n_classes == 0:
+        # nothing was trained: every prediction is empty
+        return head + (
+            "    def score():\n"
+            "        numerator = sumP = sumT = 0\n"
+            "        for slots, lbl, w in rows:\n"
+            "            sumP += w\n"
+            "            sumT += w * label_depth[lbl]\n"
+        ) + _TAIL
+    if n_classes * len(selected) <= UNROLL_LIMIT:
+        binds = ''.join(f"    t{k} = tables[{k}]\n    b{k} = base[{k}]\n    c{k} = classes[{k}]\n"
+                        for k in range(n_classes))
+        indent = "            "
+        body = _sum_statements(indent, "best_score", "b0", [f"t0[s{i}]" for i in range(len(selected))])
+        body += "            e = c0\n"
+        for k in range(1, n_classes):
+            body += _sum_statements(indent, "score", f"b{k}", [f"t{k}[s{i}]" for i in range(len(selected))])
+            body += (f"            if score > best_score:\n"
+                     f"                best_score = score\n"
+                     f"                e = c{k}\n")
+        return head + binds + (
+            "    def score():\n"
+            "        numerator = sumP = sumT = 0\n"
+            "        for slots, lbl, w in rows:\n"
+        ) + loads + body + accumulate + _TAIL
+    reads = _sum_statements("                ", "score", "base[k]",
+                            [f"flat[o + s{i}]" for i in range(len(selected))])
+    return head + (
+        f"    n_cls = {n_classes}\n"
+        "    def score():\n"
+        "        numerator = sumP = sumT = 0\n"
+        "        for slots, lbl, w in rows:\n"
+    ) + loads + (
+        "            best_score = NEG_INF\n"
+        "            best = 0\n"
+        "            for k in range(n_cls):\n"
+        "                o = offsets[k]\n"
+    ) + reads + (
+        "                if score > best_score:\n"
+        "                    best_score = score\n"
+        "                    best = k\n"
+        "            e = classes[best]\n"
+    ) + accumulate + _TAIL
+
+def scorer_factory(selected: Sequence[int], n_classes: int) -> Callable:
+    global _cached_size, _generation
+    key = (n_classes, *selected)
+    factory = _FACTORIES.get(key)
+    if factory is None:
+        source = scorer_source(selected, n_classes)
+        if _cached_size + len(source) > CACHE_BUDGET:
+            _FACTORIES.clear()
+            _cached_size = 0
+            _generation += 1
+        namespace = {'NEG_INF': float('-inf')}
+        exec(compile(source, f"<mask of {len(selected)} attributes>", 'exec'), namespace)
+        factory = _FACTORIES[key] = namespace['factory']
+        _cached_size += len(source)
+    return factory
+
+class SpecializedFold:
+    """
+    One FoldModel laid out for generated scorers: all class log tables in a
+    single flat list (class k starts at offsets[k]) and the validation rows
+    zipped once. Scorers are cached per mask, and dropped together with
+    the shared factory cache so that cache's budget bounds the compiled code.
+    """
+
+    def __init__(self, model):
+        ds = model.dataset
+        n_slots = ds.n_slots
+        self.flat = [v for table in model.tables for v in table]
+        self.offsets = [k * n_slots for k in range(len(model.tables))]
+        self.rows = list(zip(model.valid_slots, model.valid_labels, model.valid_weights))
+        self.n_classes = len(model.classes)
+        self.args = (self.rows, model.base, model.tables, self.flat, self.offsets, model.classes,
+                     ds.label_inter, ds.eval_depth, ds.label_depth)
+        self._scorers: Dict[Tuple[int, ...], Callable] = {}
+        self._generation = _generation
+
+    def score(self, selected: Sequence[int]) -> float:
+        key = tuple(selected)
+        fn = self._scorers.get(key)
+        if fn is None:
+            factory = scorer_factory(key, self.n_classes)
+            if self._generation != _generation or len(self._scorers) >= MAX_CACHED:
+                self._scorers.clear()
+                self._generation = _generation
+            fn = self._scorers[key] = factory(*self.args)
+        return fn()
+
+def main():
+    from main import parse_arff, make_folds
+    from dataset import EncodedDataset
+    from batch import FoldModel
+
+    p = ArgumentParser(description="Compare mask-specialized scorers with the generic FoldModel loop.")
+    p.add_argument('--train',  required=True, help="ARFF used for 5-fold CV")
+    p.add_argument('--masks',  type=int, default=50, help="number of random masks")
+    p.add_argument('--repeat', type=int, default=5, help="times every mask is scored (exercises the cache)")
+    args = p.parse_args()
+
+    header, names, recs = parse_arff(args.train)
+    dataset = EncodedDataset(header, names, recs)
+    random.seed(0)
+    folds = make_folds(len(recs))
+    models = [FoldModel(dataset, train, valid, False) for train, valid in folds]
+    special = [SpecializedFold(m) for m in models]
+    selections = [[a for a in range(dataset.n_feats) if random.random() < 0.5] for _ in range(args.masks)]
+
+    def run(score_fns):
+        passes, out = [], []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            out.append([[fn(sel) for fn in score_fns] for sel in selections])
+            passes.append(time.perf_counter() - started)
+        return passes, out
+
+    generic_t, generic = run([m.score for m in models])
+    special_t, special_out = run([s.score for s in special])
+    n = args.masks * args.repeat
+    print(f"{platform.python_implementation()} {platform.python_version()}\t"
+          f"{args.masks} masks x {args.repeat} passes x {len(folds)} folds")
+    print(f"generic\t\t{sum(generic_t):.4f}s\t{n / sum(generic_t):.1f} masks/s")
+    print(f"specialized\t{sum(special_t):.4f}s\t{n / sum(special_t):.1f} masks/s "
+          f"(first pass incl. compile {special_t[0]:.4f}s)")
+    print(f"speedup\t\t{sum(generic_t) / sum(special_t):.2f}x\tidentical = {generic == special_out}")
+
+if __name__ == '__main__':
+    main()
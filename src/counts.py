@@ -0,0 +1,234 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import os
+import time
+from argparse import ArgumentParser
+from multiprocessing import Pool, cpu_count
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils import str2int
+from dataset import EncodedDataset, count_attribute_values
+
+class CountTable:
+    """
+    Naive Bayes training statistics as a mergeable value: for every class
+    label, its number of rows and the count of each attribute value slot
+    (same layout as ChargeTrainingSet). Tables over the same attribute index
+    can be added and subtracted, so shards are counted apart and merged,
+    appended rows are folded into an existing table, and a CV fold's training
+    counts are the total minus the counts of its validation rows.
+    `offset` is the byte position up to which a source file has been counted,
+    None when the table was not counted from a file.
+    """
+
+    def __init__(self, attribute_index: Sequence[int]):
+        self.attribute_index = list(attribute_index)
+        self.n_slots = self.attribute_index[-1]
+        self.label_freq: Dict[str, int] = {}
+        self.label_counts: Dict[str, List[int]] = {}
+        self.offset: Optional[int] = None
+
+    @classmethod
+    def from_rows(cls, dataset: EncodedDataset, rows: Sequence[int],
+                  offset: Optional[int] = None) -> 'CountTable':
+        """Counts rows of a parsed dataset; pass the file's data end as `offset` to extend it later."""
+        table = cls(dataset.attribute_index)
+        for r, w in zip(*dataset.collapse(rows)):
+            table.add(dataset.row(r), dataset.labels[dataset.row_label[r]], w)
+        table.offset = offset
+        return table
+
+    @property
+    def n_rows(self) -> int:
+        return sum(self.label_freq.values())
+
+    def add(self, values: Sequence[int], label: str, weight: int = 1):
+        cnt = self.label_counts.get(label)
+        if cnt is None:
+            cnt = self.label_counts[label] = [0] * self.n_slots
+            self.label_freq[label] = 0
+        self.label_freq[label] += weight
+        idx = self.attribute_index
+        for aid, val in enumerate(values):
+            cnt[idx[aid] + val] += weight
+
+    def copy(self) -> 'CountTable':
+        out = CountTable(self.attribute_index)
+        out.label_freq = dict(self.label_freq)
+        out.label_counts = {lbl: cnt[:] for lbl, cnt in self.label_counts.items()}
+        out.offset = self.offset
+        return out
+
+    def _check_layout(self, other: 'CountTable'):
+        if other.attribute_index != self.attribute_index:
+            raise ValueError("Count tables have different attribute layouts")
+
+    def merge(self, other: 'CountTable') -> 'CountTable':
+        """Adds `other` into this table (in place)."""
+        self._check_layout(other)
+        for lbl, freq in other.label_freq.items():
+            cnt = self.label_counts.get(lbl)
+            if cnt is None:
+                self.label_counts[lbl] = other.label_counts[lbl][:]
+                self.label_freq[lbl] = freq
+                continue
+            self.label_freq[lbl] += freq
+            for s, c in enumerate(other.label_counts[lbl]):
+                cnt[s] += c
+        if other.offset is not None:
+            self.offset = other.offset if self.offset is None else max(self.offset, other.offset)
+        return self
+
+    def subtract(self, other: 'CountTable') -> 'CountTable':
+        """Removes the rows counted in `other`, which must be part of this table (in place)."""
+        self._check_layout(other)
+        for lbl, freq in other.label_freq.items():
+            left = self.label_freq.get(lbl, 0) - freq
+            if left < 0:
+                raise ValueError(f"Cannot subtract {freq} rows of class {lbl}, only {left + freq} counted")
+            if left == 0:
+                del self.label_freq[lbl]
+                del self.label_counts[lbl]
+                continue
+            self.label_freq[lbl] = left
+            cnt = self.label_counts[lbl]
+            for s, c in enumerate(other.label_counts[lbl]):
+                cnt[s] -= c
+        return self
+
+    def __add__(self, other: 'CountTable') -> 'CountTable':
+        return self.copy().merge(other)
+
+    def __sub__(self, other: 'CountTable') -> 'CountTable':
+        return self.copy().subtract(other)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, CountTable) and self.attribute_index == other.attribute_index
+                and self.label_freq == other.label_freq and self.label_counts == other.label_counts)
+
+    def class_counts(self, eval_classes: Sequence[str]) -> Tuple[List[int], List[List[int]]]:
+        """
+        Rolls the label counts up the hierarchy: a row counts for every
+        evaluated class that is a prefix of its label, as in
+        ChargeTrainingSet._parse_data_section. Returns (class_freq, counts).
+        """
+        eval_pos = {c: i for i, c in enumerate(eval_classes)}
+        class_freq = [0] * len(eval_classes)
+        counts = [[0] * self.n_slots for _ in eval_classes]
+        for lbl, freq in self.label_freq.items():
+            parts = lbl.split('.')
+            src = self.label_counts[lbl]
+            for lvl in range(1, len(parts) + 1):
+                e = eval_pos.get('.'.join(parts[:lvl]))
+                if e is None:
+                    continue
+                class_freq[e] += freq
+                cnt = counts[e]
+                for s, c in enumerate(src):
+                    cnt[s] += c
+        return class_freq, counts
+
+def read_layout(path: str) -> Tuple[List[int], int]:
+    """Attribute index of an ARFF header and the byte offset where its rows start."""
+    attribute_index = [0]
+    with open(path, 'rb') as f:
+        for raw in iter(f.readline, b''):
+            line = raw.decode().strip()
+            low = line.lower()
+            if low.startswith('@attribute'):
+                attribute_index.append(attribute_index[-1] + count_attribute_values(line))
+            elif low.startswith('@data'):
+                # the last attribute is the class, which has no slots
+                return attribute_index[:-1], f.tell()
+    raise ValueError(f"{path} has no @data section")
+
+def count_range(path: str, attribute_index: Sequence[int], start: int, end: int) -> CountTable:
+    """
+    Counts the rows that begin in the byte range [start, end) of the data
+    section; a row straddling `start` belongs to the previous range.
+    """
+    table = CountTable(attribute_index)
+    n_feats = len(attribute_index) - 1
+    n_values = [attribute_index[a + 1] - attribute_index[a] for a in range(n_feats)]
+    with open(path, 'rb') as f:
+        f.seek(max(0, start - 1))
+        if start > 0 and f.read(1) != b'\n':
+            f.readline()
+        while f.tell() < end:
+            raw = f.readline()
+            if not raw:
+                break
+            line = raw.decode().strip()
+            if not line or line.startswith('%'):
+                continue
+            rec = line.split(',')
+            if len(rec) != n_feats + 1:
+                raise ValueError(f"Row with {len(rec)} columns, expected {n_feats + 1}: {line}")
+            values = [str2int(v) for v in rec[:-1]]
+            for aid, val in enumerate(values):
+                if val >= n_values[aid]:
+                    raise ValueError(f"Value {rec[aid]} outside the domain of attribute {aid}")
+            table.add(values, rec[-1])
+        table.offset = f.tell()
+    return table
+
+def count_file(path: str, shards: int = 1, processes: int = None) -> CountTable:
+    """Counts an ARFF over `shards` byte ranges of its data section, in parallel, and merges them."""
+    attribute_index, data_start = read_layout(path)
+    size = os.path.getsize(path)
+    shards = max(1, min(shards, size - data_start))
+    bounds = [data_start + (size - data_start) * i // shards for i in range(shards + 1)]
+    tasks = [(path, attribute_index, bounds[i], bounds[i + 1]) for i in range(shards)]
+    if shards == 1:
+        parts = [count_range(*tasks[0])]
+    else:
+        with Pool(processes or min(shards, cpu_count())) as pool:
+            parts = pool.starmap(count_range, tasks)
+    total = CountTable(attribute_index)
+    for part in parts:
+        total.merge(part)
+    total.offset = size
+    return total
+
+def count_appended(table: CountTable, path: str) -> int:
+    """Adds the rows appended to `path` since it was counted into `table`; returns their number."""
+    if table.offset is None:
+        raise ValueError("Count table has no file offset: build it with count_file() or "
+                         "from_rows(..., offset=dataset.data_end)")
+    size = os.path.getsize(path)
+    if size <= table.offset:
+        return 0
+    part = count_range(path, table.attribute_index, table.offset, size)
+    table.merge(part)
+    table.offset = size
+    return part.n_rows
+
+def main():
+    p = ArgumentParser(description="Count an ARFF in byte-range shards and check it against one pass.")
+    p.add_argument('--train',  required=True, help="ARFF to count")
+    p.add_argument('--shards', type=int, default=cpu_count(), help="number of byte-range shards")
+    p.add_argument('--procs',  type=int, default=None, help="worker processes (default: one per shard)")
+    args = p.parse_args()
+
+    t0 = time.perf_counter()
+    single = count_file(args.train)
+    t1 = time.perf_counter()
+    sharded = count_file(args.train, args.shards, args.procs)
+    t2 = time.perf_counter()
+    print(f"rows\t{single.n_rows}\tclasses\t{len(single.label_freq)}\tslots\t{single.n_slots}")
+    print(f"single\t{t1 - t0:.4f}s")
+    print(f"{args.shards} shards\t{t2 - t1:.4f}s\tidentical = {sharded == single}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+from utils import str2int
+from charge_training_set import ChargeTrainingSet
+
+def count_attribute_values(attr_line: str) -> int:
+    """Number of nominal values declared in an '@attribute name {a,b,c}' line (1 if none)."""
+    begin = attr_line.find('{')
+    end = attr_line.rfind('}')
+    if begin == -1 or end == -1:
+        return 1
+    return attr_line[begin + 1 : end].count(',') + 1
+
+def common_prefix_levels(a: List[str], b: List[str]) -> int:
+    inter = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        inter += 1
+    return inter
+
+class EncodedDataset:
+    """
+    Integer-coded view of a parsed ARFF (see main.parse_arff).
+
+    Attribute values are stored row-major in `values`, `attribute_index` gives
+    the offset of every attribute in a per-class count table (same layout as
+    ChargeTrainingSet), and class labels are interned into `labels`. The
+    classes the Naive Bayes scores (`eval_classes`) and their usefulness come
+    from the header exactly as ChargeTrainingSet registers them, so every fast
+    path built on top of this yields the same hF as the text pipeline.
+    Identical (values, label) rows share an id in `row_group`, so scorers can
+    work on weighted unique rows (see collapse()). `data_end` is the byte size
+    of the parsed file, if known, so its counts can later take appended rows.
+    """
+
+    def __init__(self, header: Sequence[str], names: Sequence[str], recs: Sequence[Sequence[str]],
+                 data_end: Optional[int] = None):
+        attr_lines = [l.strip() for l in header if l.strip().lower().startswith('@attribute')]
+        if len(attr_lines) != len(names) or len(names) < 2:
+            raise ValueError("Header must declare at least one attribute and the class")
+
+        self.n_feats = len(names) - 1
+        self.n_values = [count_attribute_values(l) for l in attr_lines[:-1]]
+        self.attribute_index = [0] * (self.n_feats + 1)
+        for aid, nv in enumerate(self.n_values):
+            self.attribute_index[aid + 1] = self.attribute_index[aid] + nv
+        self.n_slots = self.attribute_index[self.n_feats]
+
+        # classes evaluated by the classifier, in ChargeTrainingSet order
+        ctr = ChargeTrainingSet(None, len(names), 0, True)
+        ctr._initialize_classes(attr_lines[-1])
+        ctr.compute_class_usefulness()
+        self.eval_classes: List[str] = list(ctr.classes_for_probability_evaluation.keys())
+        self.usefulness: List[float] = [ctr.classes_for_probability_evaluation[c]
+                                        for c in self.eval_classes]
+        self.eval_parts = [c.split('.') for c in self.eval_classes]
+
+        self.n_rows = len(recs)
+        self.data_end = data_end
+        self.values: List[int] = [0] * (self.n_rows * self.n_feats)
+        self.row_label: List[int] = [0] * self.n_rows
+        self.labels: List[str] = []
+        label_ids: Dict[str, int] = {}
+        n_feats = self.n_feats
+        n_values = self.n_values
+        values = self.values
+        for r, rec in enumerate(recs):
+            if len(rec) != n_feats + 1:
+                raise ValueError(f"Row {r} has {len(rec)} columns, expected {n_feats + 1}")
+            base = r * n_feats
+            for aid in range(n_feats):
+                val = str2int(rec[aid])
+                if val >= n_values[aid]:
+                    raise ValueError(f"Row {r}: value {rec[aid]} outside the domain of attribute {aid}")
+                values[base + aid] = val
+            lbl = rec[-1]
+            lid = label_ids.get(lbl)
+            if lid is None:
+                lid = label_ids[lbl] = len(self.labels)
+                self.labels.append(lbl)
+            self.row_label[r] = lid
+
+        self._group_rows()
+        self._build_label_tables()
+
+    def _group_rows(self):
+        groups: Dict[tuple, int] = {}
+        self.row_group: List[int] = [0] * self.n_rows
+        for r in range(self.n_rows):
+            key = (self.row_label[r], *self.row(r))
+            self.row_group[r] = groups.setdefault(key, len(groups))
+        self.n_unique = len(groups)
+
+    def _build_label_tables(self):
+        """Per-label relations to the evaluated classes, shared by all scorers."""
+        label_parts = [l.split('.') for l in self.labels]
+        # which eval classes a training row of this label counts for (its prefixes)
+        self.label_prefix_classes: List[List[int]] = []
+        eval_pos = {c: i for i, c in enumerate(self.eval_classes)}
+        for parts in label_parts:
+            ids = []
+            for lvl in range(1, len(parts) + 1):
+                i = eval_pos.get('.'.join(parts[:lvl]))
+                if i is not None:
+                    ids.append(i)
+            self.label_prefix_classes.append(ids)
+        # hierarchical precision/recall terms of predicting eval class e for label l
+        self.label_depth = [len(p) for p in label_parts]
+        self.eval_depth = [len(p) for p in self.eval_parts]
+        self.label_inter = [[common_prefix_levels(lp, ep) for ep in self.eval_parts]
+                            for lp in label_parts]
+
+    def row(self, r: int) -> List[int]:
+        return self.values[r * self.n_feats : (r + 1) * self.n_feats]
+
+    def collapse(self, rows: Sequence[int]) -> Tuple[List[int], List[int]]:
+        """The distinct rows among `rows` (first occurrence) and how often each occurs."""
+        position: Dict[int, int] = {}
+        unique: List[int] = []
+        weights: List[int] = []
+        for r in rows:
+            g = self.row_group[r]
+            i = position.get(g)
+            if i is None:
+                position[g] = len(unique)
+                unique.append(r)
+                weights.append(1)
+            else:
+                weights[i] += 1
+        return unique, weights
+
+    def fold_assignment(self, folds) -> List[int]:
+        """
+        Maps make_folds() output to one validation fold id per row (-1 when a
+        row is never validated, i.e. always part of the training side).
+        """
+        assign = [-1] * self.n_rows
+        for fid, (_, valid_idx) in enumerate(folds):
+            for r in valid_idx:
+                assign[r] = fid
+        return assign
+
+def log_usefulness(dataset: EncodedDataset) -> List[float]:
+    return [math.log10(u) if u > 0 else float('-inf') for u in dataset.usefulness]
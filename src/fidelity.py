@@ -0,0 +1,127 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import os
+import re
+import sys
+import math
+import time
+import random
+import subprocess
+from argparse import ArgumentParser
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# a fidelity level is (row fraction, number of folds); None stands for full fidelity
+Level = Optional[Tuple[float, int]]
+
+def stratified_ranks(labels: Sequence[str], seed: int = 0) -> Tuple[List[int], List[int]]:
+    """
+    Shuffles the rows of every class label once and returns, per row, its
+    position in that order and the size of its stratum. Taking the first
+    ceil(f * size) rows of each stratum gives nested stratified subsamples.
+    """
+    groups: Dict[str, List[int]] = {}
+    for r, lbl in enumerate(labels):
+        groups.setdefault(lbl, []).append(r)
+    rng = random.Random(seed)
+    rank = [0] * len(labels)
+    size = [0] * len(labels)
+    for lbl in sorted(groups):
+        rows = groups[lbl]
+        rng.shuffle(rows)
+        for pos, r in enumerate(rows):
+            rank[r] = pos
+            size[r] = len(rows)
+    return rank, size
+
+def level_folds(folds, ranks: Tuple[List[int], List[int]], level: Level):
+    """Restricts the first `n_folds` folds to the stratified subsample of `fraction` of the rows."""
+    if level is None:
+        return folds
+    fraction, n_folds = level
+    rank, size = ranks
+    keep = [rank[r] < math.ceil(fraction * size[r]) for r in range(len(rank))]
+    return [([r for r in train if keep[r]], [r for r in valid if keep[r]])
+            for train, valid in folds[:n_folds]]
+
+class FidelitySchedule:
+    """
+    Starts at `start_fraction` of the rows and `start_folds` folds, and ramps
+    linearly to all rows and folds at generation `full_gen`. Full fidelity is
+    reached earlier, and kept, once population diversity drops below
+    `converge_at`. Fractions are rounded up to multiples of `step` so workers
+    only ever build a handful of distinct fold tables.
+    """
+
+    def __init__(self, start_fraction: float, start_folds: int, full_gen: int,
+                 total_folds: int, converge_at: float = 0.0, step: float = 0.1):
+        self.start_fraction = min(1.0, max(step, start_fraction))
+        self.start_folds = min(total_folds, max(1, start_folds))
+        self.full_gen = max(1, full_gen)
+        self.total_folds = total_folds
+        self.converge_at = converge_at
+        self.step = step
+        self.full_since: Optional[int] = None
+
+    def level(self, gen: int, diversity: float) -> Level:
+        if self.full_since is None and (gen >= self.full_gen or diversity < self.converge_at):
+            self.full_since = gen
+        if self.full_since is not None:
+            return None
+        t = (gen - 1) / max(1, self.full_gen - 1)
+        fraction = self.start_fraction + (1 - self.start_fraction) * t
+        fraction = min(1.0, math.ceil(fraction / self.step - 1e-9) * self.step)
+        n_folds = self.start_folds + math.ceil((self.total_folds - self.start_folds) * t)
+        if fraction >= 1.0 and n_folds >= self.total_folds:
+            self.full_since = gen
+            return None
+        return round(fraction, 6), n_folds
+
+def without_fidelity(argv: Sequence[str]) -> List[str]:
+    """Drops the --fidelity-* options (and their values) from a main.py command line."""
+    out = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg.startswith('--fidelity-'):
+            skip = '=' not in arg
+        else:
+            out.append(arg)
+    return out
+
+def main():
+    p = ArgumentParser(description="Compare a multi-fidelity run with a full-fidelity run of main.py.")
+    p.add_argument('--train', required=True, help="ARFF used for 5-fold CV")
+    p.add_argument('--out',   type=str, default='out_fidelity', help="folder holding one output folder per run")
+    p.add_argument('args', nargs='*', help="main.py options after --; both runs get them, the full run "
+                                           "without the --fidelity-* ones")
+    args = p.parse_args()
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    pattern = re.compile(r"Best = ([0-9.]+) with (\d+)/(\d+) attributes")
+    rows = []
+    for name, extra in (('full', without_fidelity(args.args)), ('scheduled', args.args)):
+        started = time.time()
+        out_dir = os.path.join(args.out, name)
+        out = subprocess.run([sys.executable, script, '--train', args.train, *extra, '--out', out_dir],
+                             check=True, stdout=subprocess.PIPE, text=True).stdout
+        match = pattern.search(out)
+        rows.append((name, time.time() - started, match.group(1) if match else '?',
+                     f"{match.group(2)}/{match.group(3)}" if match else '?'))
+    print("run\tseconds\tbest\tattributes")
+    for name, secs, best, attrs in rows:
+        print(f"{name}\t{secs:.2f}\t{best}\t{attrs}")
+
+if __name__ == '__main__':
+    main()
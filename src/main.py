@@ -12,6 +12,9 @@
 #! copies or substantial portions of the Software.
 
 import os
+import sys
+import math
+import time
 import random
 from io import StringIO
 from argparse import ArgumentParser
@@ -20,42 +23,139 @@ from multiprocessing import Pool, cpu_count
 from classifier import Classifier
 from charge_training_set import ChargeTrainingSet
 from charge_test_set import ChargeTestSet
+from telemetry import Telemetry, process_rss_bytes, population_diversity
+from projection import project_arff, mask_to_names, read_attribute_names
+from ranking import METHODS, rank_attributes, seed_population, mutation_rates
+from memetic import MODES, refine_elites
+from surrogate import RidgeSurrogate, select_for_evaluation, accuracy
+from dataset import EncodedDataset
+from batch import BatchEvaluator, BatchTuner, lpt_batches, mask_cost
+from fidelity import FidelitySchedule, stratified_ranks, level_folds
+from store import ResultsStore, file_hash, split_hash, mask_key
+import native
 
 # globals for worker processes
-globals_: tuple = (None, None, None, None, None, None)
-HEADER, NAMES, RECS, FOLDS, MLNP, USF = globals_
+globals_: tuple = (None, None, None, None, None, None, None)
+HEADER, NAMES, RECS, FOLDS, MLNP, USF, EVALUATOR = globals_
+COLLAPSE = SPECIALIZE = False
+_LEVELS: dict = {}
+_RANKS = None
 
-def evolve_population(pop, scores, cxpb, mutpb):
+def evolve_population(pop, scores, cxpb, mutpb, rng=random, mut_rates=None):
     pop_size = len(pop)
     n_feats = len(pop[0])
     # tournament selection
     parents = []
     for _ in range(pop_size):
-        i, j = random.randrange(pop_size), random.randrange(pop_size)
+        i, j = rng.randrange(pop_size), rng.randrange(pop_size)
         parents.append(pop[i] if scores[i] >= scores[j] else pop[j])
 
     # one-point crossover
     offspring = [p.copy() for p in parents]
-    random.shuffle(offspring)
+    rng.shuffle(offspring)
     for i in range(0, pop_size - pop_size % 2, 2):
-        if random.random() < cxpb:
-            cut = random.randint(1, n_feats - 1)
+        if rng.random() < cxpb:
+            cut = rng.randint(1, n_feats - 1)
             offspring[i][cut:], offspring[i+1][cut:] = \
                 offspring[i+1][cut:], offspring[i][cut:]
 
-    # bit-flip mutation
-    for individual in offspring:
-        for idx in range(n_feats):
-            if random.random() < mutpb:
-                individual[idx] = not individual[idx]
+    # bit-flip mutation, optionally with per-attribute (on, off) rates
+    if mut_rates is None:
+        for individual in offspring:
+            for idx in range(n_feats):
+                if rng.random() < mutpb:
+                    individual[idx] = not individual[idx]
+    else:
+        on_rates, off_rates = mut_rates
+        for individual in offspring:
+            for idx in range(n_feats):
+                rate = off_rates[idx] if individual[idx] else on_rates[idx]
+                if rng.random() < rate:
+                    individual[idx] = not individual[idx]
     return offspring
 
-def init_worker(header, names, recs, folds, mlnp, usf):
-    global HEADER, NAMES, RECS, FOLDS, MLNP, USF
+def make_folds(n, k=5, rng=random):
+    indices = list(range(n))
+    rng.shuffle(indices)
+    fold_size = n // k
+    folds = []
+    for i in range(k):
+        start, end = i * fold_size, n if i == k - 1 else (i + 1) * fold_size
+        valid = indices[start:end]
+        in_valid = set(valid)
+        train = [idx for idx in indices if idx not in in_valid]
+        folds.append((train, valid))
+    return folds
+
+def init_worker(header, names, recs, folds, mlnp, usf, dataset=None, use_native=False, collapse=False,
+                specialize=False):
+    global HEADER, NAMES, RECS, FOLDS, MLNP, USF, EVALUATOR, COLLAPSE, SPECIALIZE, _RANKS
     HEADER, NAMES, RECS, FOLDS, MLNP, USF = header, names, recs, folds, mlnp, usf
+    COLLAPSE, SPECIALIZE = collapse, specialize
+    EVALUATOR = None
+    _LEVELS.clear()
+    _RANKS = None
+    if dataset is not None:
+        lib = native.load_library(build=False) if use_native else None
+        scorer = native.NativeScorer(lib, dataset, folds, usf) if lib is not None else None
+        EVALUATOR = BatchEvaluator(dataset, folds, usf, scorer, collapse, specialize)
 
-def fitness_worker(mask):
-    return fitness_in_memory(mask)
+def level_evaluator(level):
+    """Folds and evaluator of a fidelity level (None = full), built once per worker."""
+    global _RANKS
+    if level is None:
+        return FOLDS, EVALUATOR
+    cached = _LEVELS.get(level)
+    if cached is None:
+        if _RANKS is None:
+            _RANKS = stratified_ranks([rec[-1] for rec in RECS])
+        folds = level_folds(FOLDS, _RANKS, level)
+        # the native kernel trains on every row outside the validation fold, so subsamples stay in Python
+        evaluator = None
+        if EVALUATOR is not None:
+            evaluator = BatchEvaluator(EVALUATOR.dataset, folds, USF,
+                                       collapse=COLLAPSE, specialize=SPECIALIZE)
+        cached = _LEVELS[level] = (folds, evaluator)
+    return cached
+
+def batch_fitness_worker(task):
+    """Scores a batch of (fold id, mask) units at a fidelity level; returns (fold hF values, timing)."""
+    level, units = task
+    started = time.time()
+    folds, evaluator = level_evaluator(level)
+    if evaluator is None:
+        scores = [evaluate_mask(HEADER, NAMES, RECS, [folds[fid]], mask, MLNP, USF)
+                  for fid, mask in units]
+    else:
+        scores = evaluator.evaluate_units(units)
+    return scores, (os.getpid(), started, time.time(), process_rss_bytes())
+
+def map_fitness(pool, masks, fold_sizes, tuner, timed=False, level=None):
+    """
+    Scores a population on the pool at (individual, fold) granularity, so even
+    a small population fills a wide machine. Units are packed into batches by
+    LPT over the cost model (selected attributes x validation rows), the batch
+    count chosen by `tuner`; fold scores are averaged back per individual.
+    `fold_sizes` must describe the folds of the fidelity `level`.
+    Returns (scores, timings), timings holding one (pid, started, ended, rss)
+    tuple per batch when `timed` is set.
+    """
+    n_folds = len(fold_sizes)
+    units = [(i, fid) for i in range(len(masks)) for fid in range(n_folds)]
+    costs = [mask_cost(masks[i]) * fold_sizes[fid] for i, fid in units]
+    groups = lpt_batches(costs, tuner.n_batches(len(units)))
+    batches = [(level, [(units[u][1], masks[units[u][0]]) for u in g]) for g in groups]
+    started = time.time()
+    results = pool.map(batch_fitness_worker, batches, 1)
+    tuner.observe(len(units), time.time() - started)
+
+    fold_scores = [[0.0] * n_folds for _ in masks]
+    for g, (batch_scores, _) in zip(groups, results):
+        for u, score in zip(g, batch_scores):
+            i, fid = units[u]
+            fold_scores[i][fid] = score
+    scores = [sum(fs) / len(fs) for fs in fold_scores]
+    return scores, [t for _, t in results] if timed else []
 
 def parse_arff(path):
     header, data = [], []
@@ -96,12 +196,8 @@ def build_arff_text(header, names, records, mask):
 
     return ''.join(filtered) + '\n@data\n' + '\n'.join(lines) + '\n'
 
-def fitness_in_memory(mask):
-    header, names, recs, folds = HEADER, NAMES, RECS, FOLDS
+def evaluate_mask(header, names, recs, folds, mask, mlnp, usf):
     scores = []
-    if None in (recs, folds, MLNP, USF):
-        raise Exception("Worker globals not set")
-
     for train_idx, valid_idx in folds:
         train_recs = [recs[i] for i in train_idx]
         valid_recs = [recs[i] for i in valid_idx]
@@ -110,7 +206,7 @@ def fitness_in_memory(mask):
         valid_txt = build_arff_text(header, names, valid_recs, mask)
 
         n_attr = sum(mask) + 1
-        ctr = ChargeTrainingSet(None, n_attr, len(train_recs), MLNP)
+        ctr = ChargeTrainingSet(None, n_attr, len(train_recs), mlnp)
         ctr.open_training_file = lambda: setattr(ctr, '_fin', StringIO(train_txt))
         ctr.close_training_file = lambda: setattr(ctr, '_fin', None)
         ctr.get_training_set()
@@ -120,7 +216,7 @@ def fitness_in_memory(mask):
         cte.close_test_file = lambda: setattr(cte, '_fin', None)
         cte.get_test_set()
 
-        cl = Classifier(len(train_recs), len(valid_recs), n_attr, "", USF)
+        cl = Classifier(len(train_recs), len(valid_recs), n_attr, "", usf)
         Classifier.auxCLCTR = ctr
         Classifier.auxCLCTE = cte
         scores.append(cl.apply_classifier(False))
@@ -137,47 +233,237 @@ def main():
     p.add_argument('--mlnp',  action='store_false', help="flag mandatory leaf nodes")
     p.add_argument('--usf',   action='store_true',  help="use log-usefulness")
     p.add_argument('--out',   type=str,   default='out_ga', help="output folder for final ARFF")
+    p.add_argument('--test',  type=str,   default=None, help="test ARFF to project onto the selected attributes")
+    p.add_argument('--rank',      choices=METHODS, default=None, help="rank attributes to seed and bias the GA")
+    p.add_argument('--seed-frac', type=float, default=0.5, help="share of the initial population seeded from the ranking")
+    p.add_argument('--rank-bias', type=float, default=0.5, help="strength of the ranking bias on mutation (0..1)")
+    p.add_argument('--memetic-every',  type=int, default=0, help="refine elites by hill climbing every K generations (0 = off)")
+    p.add_argument('--memetic-elites', type=int, default=2, help="number of elites refined")
+    p.add_argument('--memetic-budget', type=int, default=0, help="fitness evaluations per memetic step (default: #attributes)")
+    p.add_argument('--memetic-mode',   choices=MODES, default='best', help="best improvement, or first improvement in batches of 8")
+    p.add_argument('--surrogate',         action='store_true', help="screen offspring with an online ridge surrogate")
+    p.add_argument('--surrogate-frac',    type=float, default=0.5, help="share of the population truly evaluated")
+    p.add_argument('--surrogate-explore', type=float, default=0.1, help="share of the population evaluated at random")
+    p.add_argument('--surrogate-warmup',  type=int,   default=0, help="true evaluations before screening (default: 2 x pop)")
+    p.add_argument('--fidelity-start',    type=float, default=1.0, help="share of rows scored in generation 1 (1 = full fidelity)")
+    p.add_argument('--fidelity-folds',    type=int,   default=5,   help="folds scored in generation 1")
+    p.add_argument('--fidelity-full-gen', type=int,   default=0,   help="generation reaching full fidelity (default: gen / 2)")
+    p.add_argument('--fidelity-converge', type=float, default=0.0, help="switch to full fidelity once diversity drops below this")
+    p.add_argument('--collapse',  action='store_true', help="classify validation rows equal on the selected attributes once")
+    p.add_argument('--store',     type=str,   default=None, help="SQLite results store to reuse and record scores")
+    p.add_argument('--warm-frac', type=float, default=0.25, help="share of the population warm-started from the store")
+    p.add_argument('--specialize', action='store_true', help="score through code generated per mask")
+    p.add_argument('--native',    action='store_true', help="score masks with the compiled C++ batch kernel")
+    p.add_argument('--telemetry',    type=str, default=None, help="append per-generation JSONL records to this file")
+    p.add_argument('--metrics-port', type=int, default=None, help="serve Prometheus metrics on localhost:PORT")
     args = p.parse_args()
 
     header, names, recs = parse_arff(args.train)
+    if args.test:
+        try:
+            missing = set(names[:-1]) - set(read_attribute_names(args.test)[:-1])
+        except OSError as e:
+            sys.stderr.write(f"[ERR] {e}\n")
+            sys.exit(1)
+        if missing:
+            sys.stderr.write(f"[ERR] Test file lacks training attributes: {', '.join(sorted(missing))}\n")
+            sys.exit(1)
     n = len(recs)
     n_feats = len(names) - 1
 
-    indices = list(range(n))
     random.seed(0)
-    random.shuffle(indices)
-    fold_size = n // 5
-    folds = []
-    for i in range(5):
-        start, end = i * fold_size, n if i == 4 else (i + 1) * fold_size
-        valid = indices[start:end]
-        train = [idx for idx in indices if idx not in valid]
-        folds.append((train, valid))
+    folds = make_folds(n)
 
     pop = [[random.random() < 0.5 for _ in range(n_feats)] for _ in range(args.pop)]
+    mut_rates = None
+    if args.rank:
+        relevance = rank_attributes(args.train, n, len(names), args.mlnp, args.rank)
+        n_seeded = min(args.pop, int(round(args.pop * args.seed_frac)))
+        pop[:n_seeded] = seed_population(relevance, n_seeded)
+        if args.rank_bias > 0:
+            mut_rates = mutation_rates(relevance, args.mutpb, args.rank_bias)
     best_mask, best_score = [], -1.0
+    memetic_evals = memetic_improved = 0
+    surrogate = RidgeSurrogate(n_feats) if args.surrogate else None
+    warmup = args.surrogate_warmup or 2 * args.pop
+    stats = {'evaluations': 0, 'saved': 0}
+    store = n_warm = None
+    if args.store:
+        store = ResultsStore(args.store, file_hash(args.train), split_hash(folds), args.usf, args.mlnp).open()
+        warm = store.best_masks(int(round(args.pop * args.warm_frac)))
+        n_warm = len(warm)
+        if warm:
+            pop[args.pop - n_warm:] = warm
+    front = []
 
-    chunksize = max(1, args.pop // (cpu_count() * 4))
+    try:
+        encoded = EncodedDataset(header, names, recs, os.path.getsize(args.train))
+    except ValueError as e:
+        sys.stderr.write(f"[WARN] {e}; scoring through the ARFF text pipeline\n")
+        encoded = None
+    use_native = False
+    if args.native:
+        use_native = encoded is not None and native.load_library() is not None
+        if not use_native:
+            sys.stderr.write(f"[WARN] Native scorer unavailable "
+                             f"({native.load_error() or 'dataset not encodable'}), using the Python classifier\n")
+    tuner = BatchTuner(cpu_count())
+    schedule = None
+    if args.fidelity_start < 1 or args.fidelity_folds < len(folds):
+        schedule = FidelitySchedule(args.fidelity_start, args.fidelity_folds,
+                                    args.fidelity_full_gen or max(1, args.gen // 2),
+                                    len(folds), args.fidelity_converge)
+    ranks = stratified_ranks([rec[-1] for rec in recs]) if schedule else None
+    level_sizes = {None: [len(valid) for _, valid in folds]}
+    state = {'level': None}
+    candidates = {}  # best masks of low-fidelity generations, re-scored at full fidelity
+    dataset = args.train.split('/')[-1]
+    telemetry = None
+    if args.telemetry or args.metrics_port is not None:
+        telemetry = Telemetry(args.telemetry, args.metrics_port, dataset)
+        try:
+            telemetry.open()
+        except OSError as e:
+            if store:
+                store.close()
+            sys.stderr.write(f"[ERR] Cannot start telemetry: {e}\n")
+            sys.exit(1)
+        if telemetry.metrics_url():
+            print(f"Serving metrics on {telemetry.metrics_url()}")
     print("gen\tmax\tavg\tdataset")
-    with Pool(initializer=init_worker,
-              initargs=(header, names, recs, folds, args.mlnp, args.usf)) as pool:
-        for gen in range(1, args.gen + 1):
-            masks = pop
-            scores = pool.map(fitness_worker, masks, chunksize)
+    started = time.time()
+    try:
+        with Pool(initializer=init_worker,
+                  initargs=(header, names, recs, folds, args.mlnp, args.usf, encoded, use_native,
+                            args.collapse, args.specialize)) as pool:
+            def evaluate(ms, timed=False):
+                level = state['level']
+                # only full-fidelity scores are stored and reused
+                known = store.lookup(ms) if store and level is None else {}
+                todo = [m for m in ms if mask_key(m) not in known]
+                fresh, tm = map_fitness(pool, todo, level_sizes[level], tuner, timed, level) if todo else ([], [])
+                stats['evaluations'] += len(todo)
+                if store and level is None and todo:
+                    store.record(todo, fresh)
+                new = iter(fresh)
+                res = [known[k] if k in known else next(new) for k in map(mask_key, ms)]
+                # low-fidelity scores are biased, the surrogate only learns true ones
+                if surrogate and level is None:
+                    for m, score in zip(ms, res):
+                        surrogate.update(m, score)
+                return res, tm
+
+            for gen in range(1, args.gen + 1):
+                dispatched = time.time()
+                reused_before = store.reused if store else 0
+                if schedule:
+                    level = schedule.level(gen, population_diversity(pop))
+                    if level != state['level']:
+                        if level not in level_sizes:
+                            level_sizes[level] = [len(valid) for _, valid in level_folds(folds, ranks, level)]
+                        desc = f"{level[0]:.0%} of rows, {level[1]}/{len(folds)} folds" if level else "full"
+                        print(f"  fidelity: {desc}")
+                    state['level'] = level
+                evaluated = list(range(len(pop)))
+                predicted = None
+                if surrogate and surrogate.n_samples >= warmup:
+                    predicted = [surrogate.predict(m) for m in pop]
+                    evaluated = select_for_evaluation(predicted, math.ceil(len(pop) * args.surrogate_frac),
+                                                      int(round(len(pop) * args.surrogate_explore)))
+                    stats['saved'] += len(pop) - len(evaluated)
+                true_scores, timings = evaluate([pop[i] for i in evaluated], bool(telemetry))
+                # unevaluated individuals compete in selection with their predicted fitness
+                scores = list(predicted) if predicted else [0.0] * len(pop)
+                for i, score in zip(evaluated, true_scores):
+                    scores[i] = score
+                fields = {}
+                if predicted:
+                    fields = accuracy([predicted[i] for i in evaluated], true_scores)
+                    fields = {'surrogate_mae': fields['mae'], 'surrogate_spearman': fields['spearman'],
+                              'surrogate_evaluated': len(evaluated), 'surrogate_saved_total': stats['saved']}
+                if schedule:
+                    level = state['level']
+                    fields['fidelity_fraction'] = level[0] if level else 1.0
+                    fields['fidelity_folds'] = level[1] if level else len(folds)
+
+                extra = 0
+                if args.memetic_every and gen % args.memetic_every == 0:
+                    def memetic_evaluate(ms):
+                        # local search batches count as worker time of this generation too
+                        res, tm = evaluate(ms, bool(telemetry))
+                        timings.extend(tm)
+                        return res
+
+                    elites = [pop[i] for i in evaluated]
+                    elite_scores = [scores[i] for i in evaluated]
+                    used, improved = refine_elites(
+                        elites, elite_scores, args.memetic_elites, args.memetic_budget or n_feats,
+                        memetic_evaluate, args.memetic_mode)
+                    for i, mask, score in zip(evaluated, elites, elite_scores):
+                        pop[i], scores[i] = mask, score
+                    extra += used
+                    memetic_evals += used
+                    memetic_improved += improved
+                finished = time.time()
+
+                true_scores = [scores[i] for i in evaluated]
+                i_best = max(evaluated, key=lambda i: scores[i])
+                if state['level'] is not None:
+                    candidates[tuple(pop[i_best])] = pop[i_best].copy()
+                else:
+                    if scores[i_best] > best_score:
+                        best_score = scores[i_best]
+                        best_mask  = pop[i_best].copy()
+                    front = {mask_key(pop[i]): (pop[i].copy(), scores[i]) for i in evaluated}
+                    front = sorted(front.values(), key=lambda ms: -ms[1])
 
-            i_best = max(range(len(scores)), key=lambda i: scores[i])
-            if scores[i_best] > best_score:
-                best_score = scores[i_best]
-                best_mask  = pop[i_best].copy()
+                if telemetry:
+                    reused = store.reused - reused_before if store else 0
+                    telemetry.record_generation(gen, true_scores, pop, timings, dispatched, finished,
+                                                best_score, extra, fields, reused)
+                print(f"{gen:2d}\t{max(true_scores):.4f}\t{sum(true_scores)/len(true_scores):.4f}\t{dataset}")
+                if predicted:
+                    print(f"  surrogate: evaluated {len(evaluated)}/{len(pop)}, saved {stats['saved']}, "
+                          f"mae {fields['surrogate_mae']:.4f}, spearman {fields['surrogate_spearman']:.3f}")
+                pop = evolve_population(pop, scores, args.cxpb, args.mutpb, mut_rates=mut_rates)
 
-            print(f"{gen:2d}\t{max(scores):.4f}\t{sum(scores)/len(scores):.4f}\t{args.train.split('/')[-1]}")
-            pop = evolve_population(pop, scores, args.cxpb, args.mutpb)
+            if schedule:
+                state['level'] = None
+                rescored = [m for key, m in candidates.items() if key != tuple(best_mask)]
+                if rescored:
+                    for mask, score in zip(rescored, evaluate(rescored)[0]):
+                        if score > best_score:
+                            best_score, best_mask = score, mask
+        if store:
+            store.record_run(vars(args), best_score, best_mask, stats['evaluations'],
+                             front or [(best_mask, best_score)])
+    finally:
+        if telemetry:
+            telemetry.close()
+        if store:
+            store.close()
 
     os.makedirs(args.out, exist_ok=True)
     out_path = os.path.join(args.out, 'train_opt.arff')
-    with open(out_path, 'w') as f:
-        f.write(build_arff_text(header, names, recs, best_mask))
+    keep = mask_to_names(names, best_mask)
+    project_arff(args.train, out_path, keep)
     print(f"\nBest = {best_score:.4f} with {sum(best_mask)}/{n_feats} attributes in {out_path}.")
+    if args.memetic_every:
+        print(f"Memetic: {memetic_evals} extra evaluations, {memetic_improved} elites improved, "
+              f"{stats['evaluations']} evaluations in total.")
+    if schedule:
+        full_from = f"generation {schedule.full_since}" if schedule.full_since else "the final re-scoring"
+        print(f"Fidelity: full from {full_from}, {len(candidates)} low-fidelity bests re-scored, "
+              f"{time.time() - started:.2f}s in total.")
+    if surrogate:
+        print(f"Surrogate: {stats['saved']} evaluations saved, {stats['evaluations']} evaluations in total.")
+    if store:
+        print(f"Store: {n_warm} masks warm-started, {store.reused} evaluations saved by stored scores, "
+              f"{store.recorded} new scores recorded in {args.store}.")
+    if args.test:
+        test_path = os.path.join(args.out, 'test_opt.arff')
+        project_arff(args.test, test_path, keep)
+        print(f"Projected test set in {test_path}.")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,89 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import random
+from typing import Callable, List, Sequence, Tuple
+
+MODES = ('best', 'first')
+# neighbours evaluated per batch in 'first' mode
+FIRST_CHUNK = 8
+
+def flip(mask: Sequence[bool], idx: int) -> List[bool]:
+    out = list(mask)
+    out[idx] = not out[idx]
+    return out
+
+def hill_climb(mask: List[bool], score: float,
+               evaluate: Callable[[List[List[bool]]], List[float]],
+               budget: int, mode: str = 'best', rng=random,
+               chunk: int = FIRST_CHUNK) -> Tuple[List[bool], float, int]:
+    """
+    Single-attribute-flip hill climbing around one elite.
+    Each step tries the flips (up to `budget`) in random order, except the one
+    undoing the previous move. 'best' evaluates them as one batch and moves to
+    the best; 'first' evaluates batches of `chunk` and moves to the first
+    improving flip, leaving the rest unevaluated. Stops at a local optimum or
+    when the budget is spent. Returns (mask, score, evaluations used).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown local search mode {mode}")
+    used = 0
+    last = -1
+    n_feats = len(mask)
+    while used < budget:
+        # flipping `last` again would return to the previous mask, whose score is known
+        candidates = [idx for idx in range(n_feats) if idx != last]
+        rng.shuffle(candidates)
+        candidates = candidates[:budget - used]
+        if not candidates:
+            break
+        step = len(candidates) if mode == 'best' else max(1, chunk)
+        pick = None
+        best_score = score
+        for start in range(0, len(candidates), step):
+            batch = candidates[start : start + step]
+            neighbors = [flip(mask, idx) for idx in batch]
+            results = evaluate(neighbors)
+            used += len(neighbors)
+            for idx, neighbor, result in zip(batch, neighbors, results):
+                if result > best_score:
+                    pick, best_score = (idx, neighbor), result
+                    if mode == 'first':
+                        break
+            if pick is not None and mode == 'first':
+                break
+        if pick is None:
+            break
+        (last, mask), score = pick, best_score
+    return mask, score, used
+
+def refine_elites(pop: List[List[bool]], scores: List[float], n_elites: int, budget: int,
+                  evaluate: Callable[[List[List[bool]]], List[float]],
+                  mode: str = 'best', rng=random) -> Tuple[int, int]:
+    """
+    Refines the `n_elites` best individuals in place (Lamarckian: improved masks
+    and scores replace the originals). The per-generation `budget` is shared by
+    the elites, best first.
+    Returns (evaluations used, individuals improved).
+    """
+    order = sorted(range(len(pop)), key=lambda i: -scores[i])[:n_elites]
+    used = improved = 0
+    for i in order:
+        if used >= budget:
+            break
+        mask, score, spent = hill_climb(pop[i], scores[i], evaluate, budget - used, mode, rng)
+        used += spent
+        if score > scores[i]:
+            pop[i], scores[i] = mask, score
+            improved += 1
+    return used, improved
@@ -0,0 +1,222 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import os
+import sys
+import glob
+import time
+import ctypes
+import random
+import subprocess
+from argparse import ArgumentParser
+from typing import Dict, List, Optional, Sequence
+
+from dataset import EncodedDataset, log_usefulness
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CLASSDIR = os.path.join(ROOT, 'src', 'original_classifier', 'classifier')
+DEFAULT_LIBRARY = os.path.join(ROOT, 'bin', 'libmpfs_ga.so')
+# NBAYES_ABI_VERSION of c_batch.h this module was written against
+ABI_VERSION = 2
+
+_c_int_p = ctypes.POINTER(ctypes.c_int)
+_c_double_p = ctypes.POINTER(ctypes.c_double)
+_c_ubyte_p = ctypes.POINTER(ctypes.c_ubyte)
+
+_LIB = None
+_LOAD_ERROR: Optional[str] = None
+
+def library_path() -> str:
+    return os.environ.get('MPFS_GA_NATIVE_LIB', DEFAULT_LIBRARY)
+
+def build_library(path: str) -> None:
+    """Compiles the bundled classifier sources into a shared library (same flags as the Makefile)."""
+    cxx = os.environ.get('CXX', 'g++')
+    sources = sorted(glob.glob(os.path.join(CLASSDIR, '*.cpp')))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    cmd = [cxx, '-Wall', '-O2', '-std=c++11', '-fPIC', '-shared', f'-I{CLASSDIR}', *sources, '-o', tmp]
+    subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    os.replace(tmp, path)  # atomic, so concurrent workers never load a partial file
+
+def is_stale(path: str) -> bool:
+    """True when the library is missing or older than any bundled source."""
+    if not os.path.exists(path):
+        return True
+    built = os.path.getmtime(path)
+    sources = glob.glob(os.path.join(CLASSDIR, '*.cpp')) + glob.glob(os.path.join(CLASSDIR, '*.h'))
+    return any(os.path.getmtime(src) > built for src in sources)
+
+def load_library(build: bool = True):
+    """
+    Returns the loaded ctypes library, (re)building it when it is missing or
+    stale and building is allowed, or None when no compiler or library is
+    available. Never raises.
+    """
+    global _LIB, _LOAD_ERROR
+    if _LIB is not None or _LOAD_ERROR is not None:
+        return _LIB
+    path = library_path()
+    try:
+        if build and is_stale(path) and 'MPFS_GA_NATIVE_LIB' not in os.environ:
+            build_library(path)
+        elif not os.path.exists(path):
+            raise OSError(f"{path} not found")
+        lib = ctypes.CDLL(path)
+        version = lib.nbayes_abi_version_c
+        prepare, score, free = lib.nbayes_prepare_c, lib.nbayes_score_c, lib.nbayes_free_c
+    except (OSError, AttributeError, subprocess.CalledProcessError) as e:
+        _LOAD_ERROR = str(e)
+        return None
+    version.restype = ctypes.c_int
+    version.argtypes = []
+    if version() != ABI_VERSION:
+        _LOAD_ERROR = f"{path} has ABI version {version()}, expected {ABI_VERSION}; rebuild it"
+        return None
+    prepare.restype = ctypes.c_void_p
+    prepare.argtypes = [
+        ctypes.c_int, ctypes.c_int,
+        _c_int_p, _c_int_p,
+        _c_int_p, ctypes.c_int,
+        _c_int_p, _c_int_p,
+        _c_int_p, _c_int_p,
+        ctypes.c_int, _c_int_p,
+        _c_double_p,
+        _c_int_p, ctypes.c_int,
+    ]
+    score.restype = ctypes.c_int
+    score.argtypes = [ctypes.c_void_p, _c_ubyte_p, ctypes.c_int, _c_double_p]
+    free.restype = None
+    free.argtypes = [ctypes.c_void_p]
+    _LIB = lib
+    return _LIB
+
+def load_error() -> Optional[str]:
+    return _LOAD_ERROR
+
+def _ints(values: Sequence[int]):
+    return (ctypes.c_int * len(values))(*values)
+
+class NativeScorer:
+    """
+    Batch hF scoring of masks through nbayes_prepare_c/nbayes_score_c. The
+    dataset buffers are packed once and every fold's tables are prepared on
+    first use and kept, so each call only ships the masks.
+    """
+
+    def __init__(self, lib, dataset: EncodedDataset, folds, usf: bool):
+        self._lib = lib
+        self.dataset = dataset
+        self.n_folds = len(folds)
+        self._tables: Dict[int, int] = {}
+
+        offsets = [0]
+        prefix = []
+        for ids in dataset.label_prefix_classes:
+            prefix.extend(ids)
+            offsets.append(len(prefix))
+        n_eval = len(dataset.eval_classes)
+        self._args = (
+            dataset.n_rows, dataset.n_feats, _ints(dataset.values), _ints(dataset.attribute_index),
+            _ints(dataset.row_label), len(dataset.labels), _ints(offsets), _ints(prefix or [0]),
+            _ints(dataset.label_depth), _ints([x for row in dataset.label_inter for x in row]),
+            n_eval, _ints(dataset.eval_depth),
+            (ctypes.c_double * n_eval)(*log_usefulness(dataset)) if usf else None,
+            _ints(dataset.fold_assignment(folds)),
+        )
+
+    def __del__(self):
+        for tables in self._tables.values():
+            self._lib.nbayes_free_c(tables)
+        self._tables.clear()
+
+    def _fold_tables(self, fid: int) -> int:
+        tables = self._tables.get(fid)
+        if tables is None:
+            if not 0 <= fid < self.n_folds:
+                raise ValueError(f"No fold {fid}, there are {self.n_folds}")
+            tables = self._lib.nbayes_prepare_c(*self._args, fid)
+            if not tables:
+                raise ValueError("nbayes_prepare_c rejected its input")
+            self._tables[fid] = tables
+        return tables
+
+    def fold_score(self, masks: Sequence[Sequence[bool]], fid: int) -> List[float]:
+        """hF of every mask on fold `fid`."""
+        ds = self.dataset
+        n_masks = len(masks)
+        if n_masks == 0:
+            return []
+        flat = bytearray(n_masks * ds.n_feats)
+        for m, mask in enumerate(masks):
+            if len(mask) != ds.n_feats:
+                raise ValueError(f"Mask has {len(mask)} bits, expected {ds.n_feats}")
+            base = m * ds.n_feats
+            for aid, keep in enumerate(mask):
+                if keep:
+                    flat[base + aid] = 1
+        c_masks = (ctypes.c_ubyte * len(flat)).from_buffer(flat)
+        out = (ctypes.c_double * n_masks)()
+        if self._lib.nbayes_score_c(self._fold_tables(fid), c_masks, n_masks, out) != 0:
+            raise ValueError("nbayes_score_c rejected its input")
+        return list(out)
+
+    def fold_scores(self, masks: Sequence[Sequence[bool]]) -> List[List[float]]:
+        """Returns one list of per-fold hF values per mask."""
+        per_fold = [self.fold_score(masks, fid) for fid in range(self.n_folds)]
+        return [list(fs) for fs in zip(*per_fold)]
+
+    def score(self, masks: Sequence[Sequence[bool]]) -> List[float]:
+        """Mean hF over the folds for every mask, like evaluate_mask()."""
+        return [sum(fs) / len(fs) for fs in self.fold_scores(masks)]
+
+def make_scorer(header, names, recs, folds, usf: bool, build: bool = True) -> Optional[NativeScorer]:
+    lib = load_library(build)
+    if lib is None:
+        return None
+    return NativeScorer(lib, EncodedDataset(header, names, recs), folds, usf)
+
+def main():
+    from main import parse_arff, make_folds, evaluate_mask
+
+    p = ArgumentParser(description="Compare the native batch scorer with the Python classifier.")
+    p.add_argument('--train', required=True, help="ARFF used for 5-fold CV")
+    p.add_argument('--masks', type=int, default=20, help="number of random masks to score")
+    p.add_argument('--mlnp',  action='store_false', help="flag mandatory leaf nodes")
+    p.add_argument('--usf',   action='store_true',  help="use log-usefulness")
+    args = p.parse_args()
+
+    header, names, recs = parse_arff(args.train)
+    random.seed(0)
+    folds = make_folds(len(recs))
+    masks = [[random.random() < 0.5 for _ in range(len(names) - 1)] for _ in range(args.masks)]
+
+    t0 = time.perf_counter()
+    scorer = make_scorer(header, names, recs, folds, args.usf)
+    if scorer is None:
+        sys.stderr.write(f"[ERR] Native library unavailable: {load_error()}\n")
+        sys.exit(1)
+    t1 = time.perf_counter()
+    native = scorer.score(masks)
+    t2 = time.perf_counter()
+    python = [evaluate_mask(header, names, recs, folds, m, args.mlnp, args.usf) for m in masks]
+    t3 = time.perf_counter()
+
+    diff = max(abs(a - b) for a, b in zip(native, python))
+    print(f"masks\t{len(masks)}")
+    print(f"python\t{t3 - t2:.4f}s\t{len(masks) / (t3 - t2):.1f} masks/s")
+    print(f"native\t{t2 - t1:.4f}s\t{len(masks) / max(t2 - t1, 1e-9):.1f} masks/s (+{t1 - t0:.4f}s setup)")
+    print(f"speedup\t{(t3 - t2) / max(t2 - t1, 1e-9):.1f}x\tmax |diff| = {diff:.3g}")
+
+if __name__ == '__main__':
+    main()
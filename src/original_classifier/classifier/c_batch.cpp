@@ -0,0 +1,208 @@
+//! MIT License
+//!
+//! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+//! Copyright (c) 2009 Jr, C. N. S. Freitas
+//! Permission is hereby granted, free of charge, to any person obtaining a copy
+//! of this software and associated documentation files (the "Software"), to deal
+//! in the Software without restriction, including without limitation the rights
+//! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+//! copies of the Software, and to permit persons to whom the Software is
+//! furnished to do so, subject to the following conditions:
+//!
+//! The above copyright notice and this permission notice shall be included in all
+//! copies or substantial portions of the Software.
+
+#include <cmath>
+#include <limits>
+#include <vector>
+
+#include "c_batch.h"
+
+using namespace std;
+
+// log10 tables and validation rows of one fold, shared by every mask
+struct FoldTables {
+    int n_feats, n_slots, n_eval;
+    vector<int> attributeIndex;  // n_feats + 1
+    vector<int> validValues;     // n_valid * n_feats
+    vector<int> validLabels;     // n_valid
+    vector<int> labelDepth;      // n_labels
+    vector<int> labelInter;      // n_labels * n_eval
+    vector<int> evalDepth;       // n_eval
+    vector<double> base;         // n_eval log10 prior (+ usefulness)
+    vector<double> logTable;     // n_eval * n_slots
+};
+
+static FoldTables* buildFoldTables(int fold, int n_rows, int n_feats,
+                                   const int* values, const int* attribute_index,
+                                   const int* row_label, int n_labels,
+                                   const int* prefix_offsets, const int* prefix_classes,
+                                   const int* label_depth, const int* label_inter,
+                                   int n_eval, const int* eval_depth,
+                                   const double* log_usefulness, const int* fold_of_row) {
+    const int n_slots = attribute_index[n_feats];
+    vector<unsigned int> counts(static_cast<size_t>(n_eval) * n_slots, 0);
+    vector<unsigned int> classFreq(n_eval, 0);
+    unsigned int n_train = 0;
+
+    FoldTables* ft = new FoldTables();
+    ft->n_feats = n_feats;
+    ft->n_slots = n_slots;
+    ft->n_eval = n_eval;
+    ft->attributeIndex.assign(attribute_index, attribute_index + n_feats + 1);
+    ft->labelDepth.assign(label_depth, label_depth + n_labels);
+    ft->labelInter.assign(label_inter, label_inter + static_cast<size_t>(n_labels) * n_eval);
+    ft->evalDepth.assign(eval_depth, eval_depth + n_eval);
+    for (int r = 0; r < n_rows; ++r) {
+        const int* row = values + static_cast<size_t>(r) * n_feats;
+        int lbl = row_label[r];
+        if (fold_of_row[r] == fold) {
+            ft->validValues.insert(ft->validValues.end(), row, row + n_feats);
+            ft->validLabels.push_back(lbl);
+            continue;
+        }
+        ++n_train;
+        for (int k = prefix_offsets[lbl]; k < prefix_offsets[lbl + 1]; ++k) {
+            int e = prefix_classes[k];
+            classFreq[e]++;
+            unsigned int* cnt = &counts[static_cast<size_t>(e) * n_slots];
+            for (int a = 0; a < n_feats; ++a) {
+                cnt[attribute_index[a] + row[a]]++;
+            }
+        }
+    }
+
+    const double minusInf = -numeric_limits<double>::infinity();
+    const double smoothing = n_train > 0 ? log10(1.0 / n_train) : minusInf;
+    ft->base.assign(n_eval, minusInf);
+    ft->logTable.assign(static_cast<size_t>(n_eval) * n_slots, smoothing);
+    for (int e = 0; e < n_eval; ++e) {
+        unsigned int cfreq = classFreq[e];
+        if (cfreq == 0) continue;
+        double prior = log10(static_cast<double>(cfreq) / n_train);
+        if (log_usefulness) prior += log_usefulness[e];
+        ft->base[e] = prior;
+        const unsigned int* cnt = &counts[static_cast<size_t>(e) * n_slots];
+        double* lt = &ft->logTable[static_cast<size_t>(e) * n_slots];
+        for (int s = 0; s < n_slots; ++s) {
+            if (cnt[s] > 0) lt[s] = log10(static_cast<double>(cnt[s]) / cfreq);
+        }
+    }
+    return ft;
+}
+
+static double scoreMask(const FoldTables &ft, const unsigned char* mask, vector<int> &selected) {
+    const int n_feats = ft.n_feats, n_slots = ft.n_slots, n_eval = ft.n_eval;
+    selected.clear();
+    for (int a = 0; a < n_feats; ++a) {
+        if (mask[a]) selected.push_back(a);
+    }
+    const size_t n_sel = selected.size();
+
+    unsigned int numerator = 0, sumP = 0, sumT = 0;
+    for (size_t v = 0; v < ft.validLabels.size(); ++v) {
+        const int* row = &ft.validValues[v * n_feats];
+        double bestScore = -numeric_limits<double>::infinity();
+        int bestClass = -1;
+        for (int e = 0; e < n_eval; ++e) {
+            double score = ft.base[e];
+            const double* lt = &ft.logTable[static_cast<size_t>(e) * n_slots];
+            for (size_t k = 0; k < n_sel; ++k) {
+                int a = selected[k];
+                score += lt[ft.attributeIndex[a] + row[a]];
+            }
+            if (score > bestScore) {
+                bestScore = score;
+                bestClass = e;
+            }
+        }
+        int lbl = ft.validLabels[v];
+        if (bestClass >= 0) {
+            numerator += ft.labelInter[static_cast<size_t>(lbl) * n_eval + bestClass];
+            sumP += ft.evalDepth[bestClass];
+        } else {
+            sumP += 1; // empty prediction counts as one unmatched level
+        }
+        sumT += ft.labelDepth[lbl];
+    }
+
+    double hP = sumP > 0 ? static_cast<double>(numerator) / sumP : 0.0;
+    double hR = sumT > 0 ? static_cast<double>(numerator) / sumT : 0.0;
+    return (hP + hR) == 0 ? 0.0 : 100 * (2 * hP * hR) / (hP + hR);
+}
+
+static bool validInput(int n_rows, int n_feats, const int* row_label, int n_labels,
+                       int n_eval, const int* fold_of_row, int n_folds) {
+    if (n_rows < 0 || n_feats <= 0 || n_eval <= 0 || n_folds <= 0) return false;
+    for (int r = 0; r < n_rows; ++r) {
+        if (row_label[r] < 0 || row_label[r] >= n_labels) return false;
+        if (fold_of_row[r] >= n_folds) return false;
+    }
+    return true;
+}
+
+extern "C" {
+    int nbayes_abi_version_c(void) {
+        return NBAYES_ABI_VERSION;
+    }
+
+    void* nbayes_prepare_c(int n_rows, int n_feats,
+                           const int* values, const int* attribute_index,
+                           const int* row_label, int n_labels,
+                           const int* prefix_offsets, const int* prefix_classes,
+                           const int* label_depth, const int* label_inter,
+                           int n_eval, const int* eval_depth,
+                           const double* log_usefulness,
+                           const int* fold_of_row, int fold) {
+        if (fold < 0 || !validInput(n_rows, n_feats, row_label, n_labels, n_eval,
+                                    fold_of_row, numeric_limits<int>::max())) {
+            return NULL;
+        }
+        return buildFoldTables(fold, n_rows, n_feats, values, attribute_index, row_label, n_labels,
+                               prefix_offsets, prefix_classes, label_depth, label_inter,
+                               n_eval, eval_depth, log_usefulness, fold_of_row);
+    }
+
+    int nbayes_score_c(const void* tables, const unsigned char* masks, int n_masks, double* scores) {
+        if (tables == NULL || n_masks < 0) return -1;
+        const FoldTables &ft = *static_cast<const FoldTables*>(tables);
+        vector<int> selected;
+        for (int m = 0; m < n_masks; ++m) {
+            scores[m] = scoreMask(ft, masks + static_cast<size_t>(m) * ft.n_feats, selected);
+        }
+        return 0;
+    }
+
+    void nbayes_free_c(void* tables) {
+        delete static_cast<FoldTables*>(tables);
+    }
+
+    int nbayes_batch_c(int n_rows, int n_feats,
+                       const int* values, const int* attribute_index,
+                       const int* row_label, int n_labels,
+                       const int* prefix_offsets, const int* prefix_classes,
+                       const int* label_depth, const int* label_inter,
+                       int n_eval, const int* eval_depth,
+                       const double* log_usefulness,
+                       const int* fold_of_row, int n_folds,
+                       const unsigned char* masks, int n_masks,
+                       double* fold_scores) {
+        if (n_masks < 0 || !validInput(n_rows, n_feats, row_label, n_labels, n_eval,
+                                       fold_of_row, n_folds)) {
+            return -1;
+        }
+        vector<int> selected;
+        for (int f = 0; f < n_folds; ++f) {
+            FoldTables* ft = buildFoldTables(f, n_rows, n_feats, values, attribute_index, row_label,
+                                             n_labels, prefix_offsets, prefix_classes, label_depth,
+                                             label_inter, n_eval, eval_depth, log_usefulness,
+                                             fold_of_row);
+            for (int m = 0; m < n_masks; ++m) {
+                fold_scores[static_cast<size_t>(m) * n_folds + f] =
+                    scoreMask(*ft, masks + static_cast<size_t>(m) * n_feats, selected);
+            }
+            delete ft;
+        }
+        return 0;
+    }
+}
@@ -0,0 +1,108 @@
+//! MIT License
+//!
+//! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+//! Copyright (c) 2009 Jr, C. N. S. Freitas
+//! Permission is hereby granted, free of charge, to any person obtaining a copy
+//! of this software and associated documentation files (the "Software"), to deal
+//! in the Software without restriction, including without limitation the rights
+//! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+//! copies of the Software, and to permit persons to whom the Software is
+//! furnished to do so, subject to the following conditions:
+//!
+//! The above copyright notice and this permission notice shall be included in all
+//! copies or substantial portions of the Software.
+
+#ifndef C_BATCH_H
+#define C_BATCH_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/// Global Model Naive Bayes Classifier - batch scoring over masks and folds
+///
+/// Scores many attribute masks on an integer-coded dataset held in memory. Per
+/// fold, the per-class count table and its log10 likelihoods are built once for
+/// all attributes and shared by every mask, which is valid because the Naive
+/// Bayes tables of an attribute subset are slices of the full tables.
+///
+/// The arithmetic follows the Python classifier (src/classifier.py): scores are
+/// summed in log10 space in attribute order, unseen values use log10(1/n), and
+/// ties keep the first evaluated class, so the returned hF values are identical.
+///
+/// nbayes_prepare_c() builds the tables of one fold and nbayes_score_c() scores
+/// masks against them, so a caller scoring many small batches prepares each fold
+/// once. nbayes_batch_c() does both for every fold in a single call.
+
+/// Bumped whenever an exported signature changes; callers check it before use.
+#define NBAYES_ABI_VERSION 2
+
+/// @return NBAYES_ABI_VERSION of the compiled library
+int nbayes_abi_version_c(void);
+
+/// Builds the log10 tables of one fold and copies its validation rows.
+///
+/// @param n_rows, n_feats      Dataset shape (class column excluded)
+/// @param values               n_rows * n_feats attribute values, row-major
+/// @param attribute_index      n_feats + 1 offsets of each attribute in a count table
+/// @param row_label            Label id of every row
+/// @param n_labels             Number of distinct labels
+/// @param prefix_offsets       n_labels + 1 offsets into prefix_classes
+/// @param prefix_classes       Evaluated classes each label counts for (its prefixes)
+/// @param label_depth          Number of levels of every label
+/// @param label_inter          n_labels * n_eval common-prefix lengths
+/// @param n_eval               Number of evaluated classes
+/// @param eval_depth           Number of levels of every evaluated class
+/// @param log_usefulness       n_eval log10 usefulness values, or NULL to disable
+/// @param fold_of_row          Validation fold of every row, -1 for training only
+/// @param fold                 Fold to prepare
+///
+/// @return Opaque tables to pass to nbayes_score_c() and release with
+///         nbayes_free_c(), or NULL on inconsistent input
+void* nbayes_prepare_c(int n_rows, int n_feats,
+                       const int* values, const int* attribute_index,
+                       const int* row_label, int n_labels,
+                       const int* prefix_offsets, const int* prefix_classes,
+                       const int* label_depth, const int* label_inter,
+                       int n_eval, const int* eval_depth,
+                       const double* log_usefulness,
+                       const int* fold_of_row, int fold);
+
+/// Scores masks on a fold prepared by nbayes_prepare_c().
+///
+/// @param tables               Prepared fold
+/// @param masks                n_masks * n_feats selection flags
+/// @param n_masks              Number of masks
+/// @param scores               Output, n_masks hF values
+///
+/// @return 0 on success, -1 on inconsistent input
+int nbayes_score_c(const void* tables, const unsigned char* masks, int n_masks, double* scores);
+
+/// Releases tables returned by nbayes_prepare_c().
+void nbayes_free_c(void* tables);
+
+/// Prepares every fold and scores all masks on it; same parameters as
+/// nbayes_prepare_c() plus:
+///
+/// @param n_folds              Number of folds
+/// @param masks                n_masks * n_feats selection flags
+/// @param n_masks              Number of masks
+/// @param fold_scores          Output, n_masks * n_folds hF values
+///
+/// @return 0 on success, -1 on inconsistent input
+int nbayes_batch_c(int n_rows, int n_feats,
+                   const int* values, const int* attribute_index,
+                   const int* row_label, int n_labels,
+                   const int* prefix_offsets, const int* prefix_classes,
+                   const int* label_depth, const int* label_inter,
+                   int n_eval, const int* eval_depth,
+                   const double* log_usefulness,
+                   const int* fold_of_row, int n_folds,
+                   const unsigned char* masks, int n_masks,
+                   double* fold_scores);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif // C_BATCH_H
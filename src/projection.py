@@ -0,0 +1,128 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import os
+import sys
+from operator import itemgetter
+from argparse import ArgumentParser
+from typing import Iterable, List, Sequence, Set, Tuple
+
+WRITE_BUFFER = 1 << 20
+
+def read_header(fin) -> Tuple[List[str], List[str]]:
+    """
+    Consumes lines up to and including '@data'.
+    Returns (header lines, attribute names), the class being the last name.
+    """
+    header = []
+    for line in fin:
+        if line.strip().lower().startswith('@data'):
+            break
+        header.append(line)
+    attrs = [l for l in header if l.strip().lower().startswith('@attribute')]
+    return header, [a.split()[1] for a in attrs]
+
+def read_attribute_names(path: str) -> List[str]:
+    with open(path, 'r') as f:
+        return read_header(f)[1]
+
+def mask_to_names(names: Sequence[str], mask: Sequence[bool]) -> Set[str]:
+    if len(mask) != len(names) - 1:
+        raise ValueError(f"Mask has {len(mask)} bits but the dataset has {len(names) - 1} attributes")
+    return {nm for nm, keep in zip(names, mask) if keep}
+
+def parse_mask(text: str) -> List[bool]:
+    bits = text.strip()
+    if not bits or set(bits) - {'0', '1'}:
+        raise ValueError("Mask must be a non-empty string of 0/1")
+    return [c == '1' for c in bits]
+
+def project_lines(lines: Iterable[str], columns: Sequence[int]):
+    """Yields the selected comma-separated columns of every data line (class last)."""
+    if len(columns) == 1:
+        col = columns[0]
+        pick = lambda parts: (parts[col],)
+    else:
+        pick = itemgetter(*columns)
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith('%'):
+            continue
+        yield ','.join(pick(line.split(',')))
+
+def project_arff(src: str, dst: str, keep: Set[str], buffer_size: int = WRITE_BUFFER) -> int:
+    """
+    Streams `src` into `dst` keeping the attributes named in `keep` plus the
+    class. Memory stays constant whatever the file size.
+    Returns the number of data rows written.
+    """
+    rows = 0
+    with open(src, 'r', buffering=buffer_size) as fin, \
+         open(dst, 'w', buffering=buffer_size) as fout:
+        header, names = read_header(fin)
+        if not names:
+            raise ValueError(f"No @attribute lines in {src}")
+        cls = names[-1]
+        columns = [i for i, nm in enumerate(names[:-1]) if nm in keep] + [len(names) - 1]
+
+        for line in header:
+            if line.strip().lower().startswith('@attribute'):
+                nm = line.split()[1]
+                if nm == cls or nm in keep:
+                    fout.write(line)
+            else:
+                fout.write(line)
+        fout.write('\n@data\n')
+
+        write = fout.write
+        for out in project_lines(fin, columns):
+            write(out)
+            write('\n')
+            rows += 1
+    return rows
+
+def main():
+    p = ArgumentParser(description="Project train/test ARFF files onto a selected attribute subset.")
+    p.add_argument('--train', required=True, help="ARFF whose attribute order defines --mask")
+    p.add_argument('--test',  default=None, help="optional test ARFF with the same attributes")
+    sel = p.add_mutually_exclusive_group(required=True)
+    sel.add_argument('--mask', help="bit string, one bit per non-class attribute of --train")
+    sel.add_argument('--like', help="keep the attributes declared in this ARFF (e.g. train_opt.arff)")
+    p.add_argument('--out', default='out_ga', help="output folder for the projected files")
+    args = p.parse_args()
+
+    names = read_attribute_names(args.train)
+    try:
+        if args.mask:
+            keep = mask_to_names(names, parse_mask(args.mask))
+        else:
+            keep = set(read_attribute_names(args.like)[:-1])
+    except ValueError as e:
+        sys.stderr.write(f"[ERR] {e}\n")
+        sys.exit(1)
+
+    os.makedirs(args.out, exist_ok=True)
+    jobs = [(args.train, 'train_opt.arff')]
+    if args.test:
+        missing = keep - set(read_attribute_names(args.test)[:-1])
+        if missing:
+            sys.stderr.write(f"[ERR] Test file lacks selected attributes: {', '.join(sorted(missing))}\n")
+            sys.exit(1)
+        jobs.append((args.test, 'test_opt.arff'))
+    for src, name in jobs:
+        dst = os.path.join(args.out, name)
+        rows = project_arff(src, dst, keep)
+        print(f"{dst}: {len(keep)} attributes, {rows} rows")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import math
+import random
+from argparse import ArgumentParser
+from typing import List, Tuple
+
+from utils import get_datasets_profile
+from charge_training_set import ChargeTrainingSet
+
+METHODS = ('su', 'hmi')
+
+def _entropy(counts, total) -> float:
+    h = 0.0
+    for c in counts:
+        if c > 0:
+            p = c / total
+            h -= p * math.log2(p)
+    return h
+
+def level_classes(ctr: ChargeTrainingSet) -> List[List[str]]:
+    """Groups the observed classes of `ctr.class_freq` by depth (level 1 first)."""
+    levels: List[List[str]] = []
+    for cid in ctr.class_freq:
+        depth = cid.count('.') + 1
+        while len(levels) < depth:
+            levels.append([])
+        levels[depth - 1].append(cid)
+    return levels
+
+def attribute_relevance(ctr: ChargeTrainingSet, method: str = 'su') -> List[float]:
+    """
+    Scores every non-class attribute of a loaded training set in one pass over
+    its per-class value counts.
+    Each hierarchy level is treated as a flat problem over the examples that
+    reach it; the per-level mutual information ('hmi') or symmetric uncertainty
+    ('su') is averaged with weights proportional to those examples.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown ranking method {method}")
+    attr_idx = ctr.attribute_index
+    n_feats = ctr.number_of_attributes - 1
+    niav = ctr.number_of_independent_attribute_values
+    scores = [0.0] * n_feats
+    weight_sum = 0
+
+    for classes in level_classes(ctr):
+        freqs = [ctr.class_freq[cid] for cid in classes]
+        class_counts = [f[niav] for f in freqs]
+        total = sum(class_counts)
+        if total == 0:
+            continue
+        h_class = _entropy(class_counts, total)
+        weight_sum += total
+
+        for aid in range(n_feats):
+            start, end = attr_idx[aid], attr_idx[aid + 1]
+            value_counts = [0] * (end - start)
+            joint = 0.0
+            for f in freqs:
+                for v in range(end - start):
+                    value_counts[v] += f[start + v]
+            seen = sum(value_counts)
+            if seen == 0:
+                continue
+            for f, nc in zip(freqs, class_counts):
+                for v in range(end - start):
+                    n_cv = f[start + v]
+                    if n_cv > 0:
+                        joint += n_cv / seen * math.log2(n_cv * seen / (nc * value_counts[v]))
+            if method == 'hmi':
+                score = joint
+            else:
+                denom = h_class + _entropy(value_counts, seen)
+                score = 2 * joint / denom if denom > 0 else 0.0
+            scores[aid] += total * score
+
+    if weight_sum:
+        scores = [s / weight_sum for s in scores]
+    return scores
+
+def rank_attributes(training_file: str, n_recs: int, n_attrs: int,
+                    mlnp: bool, method: str = 'su') -> List[float]:
+    ctr = ChargeTrainingSet(training_file, n_attrs, n_recs, mlnp)
+    ctr.get_training_set()
+    return attribute_relevance(ctr, method)
+
+def rank_positions(scores: List[float]) -> List[float]:
+    """Maps scores to [0, 1] by rank (1 = most relevant); ties share the same value."""
+    n = len(scores)
+    if n < 2:
+        return [1.0] * n
+    order = sorted(range(n), key=lambda i: scores[i])
+    pos = [0.0] * n
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and scores[order[j + 1]] == scores[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            pos[order[k]] = (i + j) / 2 / (n - 1)
+        i = j + 1
+    return pos
+
+def seed_population(scores: List[float], n_seeded: int, rng=random) -> List[List[bool]]:
+    """
+    Draws individuals whose bits are switched on with a probability that grows
+    with the attribute rank, from 0.1 for the least to 0.9 for the most relevant.
+    """
+    pos = rank_positions(scores)
+    probs = [0.1 + 0.8 * r for r in pos]
+    return [[rng.random() < p for p in probs] for _ in range(n_seeded)]
+
+def mutation_rates(scores: List[float], mutpb: float, bias: float) -> Tuple[List[float], List[float]]:
+    """
+    Per-attribute bit-flip probabilities (switch on, switch off). With bias b,
+    relevant attributes are switched on up to (1 + b) times more often and off
+    (1 - b) times as often; the average rate stays `mutpb`.
+    """
+    pos = rank_positions(scores)
+    on = [min(1.0, mutpb * (1 + bias * (2 * r - 1))) for r in pos]
+    off = [min(1.0, mutpb * (1 - bias * (2 * r - 1))) for r in pos]
+    return on, off
+
+def main():
+    p = ArgumentParser(description="Rank ARFF attributes by relevance to the class hierarchy.")
+    p.add_argument('--train',  required=True)
+    p.add_argument('--method', choices=METHODS, default='su')
+    p.add_argument('--mlnp',   action='store_false', help="flag mandatory leaf nodes")
+    p.add_argument('--top',    type=int, default=0, help="only print the N best attributes")
+    args = p.parse_args()
+
+    n_recs, _, n_attrs = get_datasets_profile(args.train, args.train)
+    scores = rank_attributes(args.train, n_recs, n_attrs, args.mlnp, args.method)
+    names = []
+    with open(args.train, 'r') as f:
+        for line in f:
+            if line.strip().lower().startswith('@data'):
+                break
+            if line.strip().lower().startswith('@attribute'):
+                names.append(line.split()[1])
+    order = sorted(range(len(scores)), key=lambda i: -scores[i])
+    if args.top:
+        order = order[:args.top]
+    for i in order:
+        print(f"{scores[i]:.6f}\t{names[i]}")
+
+if __name__ == '__main__':
+    main()
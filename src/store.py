@@ -0,0 +1,129 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import json
+import time
+import hashlib
+import sqlite3
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    dataset TEXT NOT NULL, split TEXT NOT NULL, usf INTEGER NOT NULL, mlnp INTEGER NOT NULL,
+    mask TEXT NOT NULL, score REAL NOT NULL,
+    PRIMARY KEY (dataset, split, usf, mlnp, mask)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dataset TEXT NOT NULL, split TEXT NOT NULL, usf INTEGER NOT NULL, mlnp INTEGER NOT NULL,
+    finished REAL NOT NULL, params TEXT NOT NULL, best REAL NOT NULL, best_mask TEXT NOT NULL,
+    evaluations INTEGER NOT NULL, reused INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fronts (
+    run INTEGER NOT NULL REFERENCES runs(id), position INTEGER NOT NULL,
+    mask TEXT NOT NULL, score REAL NOT NULL,
+    PRIMARY KEY (run, position)
+);
+"""
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def split_hash(folds) -> str:
+    """Identifies a CV split by its validation folds, so stored scores are only reused on the same split."""
+    h = hashlib.sha256()
+    for _, valid in folds:
+        h.update(','.join(map(str, valid)).encode())
+        h.update(b';')
+    return h.hexdigest()
+
+def mask_key(mask: Sequence[bool]) -> str:
+    return ''.join('1' if b else '0' for b in mask)
+
+def key_mask(key: str) -> List[bool]:
+    return [c == '1' for c in key]
+
+class ResultsStore:
+    """
+    SQLite record of full-fidelity fitness values, keyed by dataset hash,
+    fold split and the classifier flags, plus every finished run with its
+    final front. Later runs warm-start from the best known masks and reuse
+    stored scores instead of re-evaluating.
+    """
+
+    def __init__(self, path: str, dataset: str, split: str, usf: bool, mlnp: bool):
+        self.path = path
+        self.key = (dataset, split, int(usf), int(mlnp))
+        self.reused = 0
+        self.recorded = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+    def open(self):
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(SCHEMA)
+        return self
+
+    def close(self):
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def best_masks(self, n: int) -> List[List[bool]]:
+        rows = self._db.execute(
+            "SELECT mask FROM evaluations WHERE dataset=? AND split=? AND usf=? AND mlnp=? "
+            "ORDER BY score DESC, mask LIMIT ?", (*self.key, n)).fetchall()
+        return [key_mask(m) for (m,) in rows]
+
+    def lookup(self, masks: Sequence[Sequence[bool]]) -> Dict[str, float]:
+        """Stored scores of the given masks, by mask key; counts them as reused."""
+        keys = sorted({mask_key(m) for m in masks})
+        found: Dict[str, float] = {}
+        for i in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+            chunk = keys[i : i + 500]
+            rows = self._db.execute(
+                "SELECT mask, score FROM evaluations WHERE dataset=? AND split=? AND usf=? AND mlnp=? "
+                f"AND mask IN ({','.join('?' * len(chunk))})", (*self.key, *chunk)).fetchall()
+            found.update(rows)
+        self.reused += sum(1 for m in masks if mask_key(m) in found)
+        return found
+
+    def record(self, masks: Sequence[Sequence[bool]], scores: Sequence[float]):
+        cur = self._db.executemany(
+            "INSERT OR IGNORE INTO evaluations VALUES (?, ?, ?, ?, ?, ?)",
+            [(*self.key, mask_key(m), s) for m, s in zip(masks, scores)])
+        self.recorded += cur.rowcount
+        self._db.commit()
+
+    def record_run(self, params: dict, best_score: float, best_mask: Sequence[bool],
+                   evaluations: int, front: Sequence[Tuple[Sequence[bool], float]]) -> int:
+        cur = self._db.execute(
+            "INSERT INTO runs (dataset, split, usf, mlnp, finished, params, best, best_mask, "
+            "evaluations, reused) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*self.key, time.time(), json.dumps(params, sort_keys=True), best_score,
+             mask_key(best_mask), evaluations, self.reused))
+        run = cur.lastrowid
+        self._db.executemany("INSERT INTO fronts VALUES (?, ?, ?, ?)",
+                             [(run, i, mask_key(m), s) for i, (m, s) in enumerate(front)])
+        self._db.commit()
+        return run
@@ -0,0 +1,98 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import random
+from typing import Dict, List, Sequence
+
+class RidgeSurrogate:
+    """
+    Ridge regression of fitness on the mask bits (plus an intercept), trained
+    online by recursive least squares: every (mask, score) pair updates the
+    exact ridge solution in O(d^2), with no refit over past samples.
+    """
+
+    def __init__(self, n_feats: int, reg: float = 1.0):
+        d = n_feats + 1
+        self.d = d
+        self.n_samples = 0
+        self.weights = [0.0] * d
+        # inverse of the regularized Gram matrix, starts at I / reg
+        self.P = [[(1.0 / reg if i == j else 0.0) for j in range(d)] for i in range(d)]
+
+    def _active(self, mask: Sequence[bool]) -> List[int]:
+        return [0] + [a + 1 for a, keep in enumerate(mask) if keep]
+
+    def predict(self, mask: Sequence[bool]) -> float:
+        w = self.weights
+        return sum(w[i] for i in self._active(mask))
+
+    def update(self, mask: Sequence[bool], score: float):
+        active = self._active(mask)
+        P, w, d = self.P, self.weights, self.d
+        # x is binary, so P x is the sum of the active columns
+        px = [sum(row[i] for i in active) for row in P]
+        denom = 1.0 + sum(px[i] for i in active)
+        gain = [v / denom for v in px]
+        err = score - sum(w[i] for i in active)
+        for i in range(d):
+            w[i] += gain[i] * err
+        for i in range(d):
+            gi = gain[i]
+            if gi == 0.0:
+                continue
+            row = P[i]
+            for j in range(d):
+                row[j] -= gi * px[j]
+        self.n_samples += 1
+
+def select_for_evaluation(predictions: Sequence[float], n_eval: int, n_explore: int,
+                          rng=random) -> List[int]:
+    """
+    Indices that get a true evaluation: the best predictions, plus `n_explore`
+    drawn uniformly from the others so the model keeps seeing fresh regions.
+    """
+    n = len(predictions)
+    n_eval = max(1, min(n, n_eval))
+    n_explore = max(0, min(n_explore, n_eval - 1))
+    order = sorted(range(n), key=lambda i: -predictions[i])
+    chosen = order[:n_eval - n_explore]
+    rest = order[n_eval - n_explore:]
+    chosen += rng.sample(rest, min(n_explore, len(rest)))
+    return sorted(chosen)
+
+def _ranks(values: Sequence[float]) -> List[float]:
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2
+        i = j + 1
+    return ranks
+
+def accuracy(predicted: Sequence[float], actual: Sequence[float]) -> Dict[str, float]:
+    """Mean absolute error and Spearman rank correlation of the predictions."""
+    n = len(actual)
+    if n == 0:
+        return {'mae': 0.0, 'spearman': 0.0}
+    mae = sum(abs(p - a) for p, a in zip(predicted, actual)) / n
+    rp, ra = _ranks(predicted), _ranks(actual)
+    mp, ma = sum(rp) / n, sum(ra) / n
+    cov = sum((x - mp) * (y - ma) for x, y in zip(rp, ra))
+    vp = sum((x - mp) ** 2 for x in rp)
+    va = sum((y - ma) ** 2 for y in ra)
+    rho = cov / (vp * va) ** 0.5 if vp > 0 and va > 0 else 0.0
+    return {'mae': mae, 'spearman': rho}
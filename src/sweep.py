@@ -0,0 +1,250 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import os
+import sys
+import time
+import queue
+import random
+import itertools
+from collections import OrderedDict
+from argparse import ArgumentParser
+from multiprocessing import Pool, cpu_count
+from typing import Dict, List, Optional, Tuple
+
+from main import parse_arff, make_folds, evaluate_mask, evolve_population
+from dataset import EncodedDataset
+from batch import BatchEvaluator
+from store import file_hash
+
+RESULT_COLUMNS = [
+    'job', 'dataset', 'seed', 'pop', 'gen', 'cxpb', 'mutpb', 'usf', 'mlnp',
+    'best', 'n_selected', 'n_feats', 'evaluations', 'seconds', 'mask',
+]
+
+# globals for worker processes: dataset key -> (header, names, recs)
+DATASETS: Dict[str, tuple] = {}
+_ENCODED: Dict[str, Optional[EncodedDataset]] = {}
+# fold splits and evaluators are per (dataset, seed[, usf]); only the most recently used are kept
+CACHE_SIZE = 4
+_FOLDS_CACHE: 'OrderedDict[Tuple[str, int], list]' = OrderedDict()
+_EVALUATORS: 'OrderedDict[Tuple[str, int, bool], BatchEvaluator]' = OrderedDict()
+
+def init_sweep_worker(datasets, cache_size=CACHE_SIZE):
+    global DATASETS, CACHE_SIZE
+    DATASETS = datasets
+    CACHE_SIZE = max(1, cache_size)
+    _ENCODED.clear()
+    _FOLDS_CACHE.clear()
+    _EVALUATORS.clear()
+
+def _cached(cache: OrderedDict, key, build):
+    """LRU lookup: builds missing entries and evicts beyond CACHE_SIZE."""
+    value = cache.get(key)
+    if value is None:
+        value = cache[key] = build()
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return value
+
+def sweep_fitness_worker(task):
+    job_id, idx, key, seed, mlnp, usf, mask = task
+    header, names, recs = DATASETS[key]
+    folds = _cached(_FOLDS_CACHE, (key, seed), lambda: make_folds(len(recs), rng=random.Random(seed)))
+    if key not in _ENCODED:
+        try:
+            _ENCODED[key] = EncodedDataset(header, names, recs)
+        except ValueError:
+            _ENCODED[key] = None
+    if _ENCODED[key] is None:
+        return job_id, idx, evaluate_mask(header, names, recs, folds, mask, mlnp, usf)
+    evaluator = _cached(_EVALUATORS, (key, seed, usf), lambda: BatchEvaluator(_ENCODED[key], folds, usf))
+    return job_id, idx, evaluator.evaluate([mask])[0]
+
+class SweepJob:
+    """
+    One GA run of the grid, advanced one generation at a time by the scheduler.
+    Seeding mirrors main(): the same Random(seed) shuffles the folds, draws the
+    initial population and drives evolution, so seed 0 reproduces a plain run.
+    """
+
+    def __init__(self, key: str, n_recs: int, n_feats: int, seed: int, pop: int, gen: int,
+                 cxpb: float, mutpb: float, usf: bool, mlnp: bool):
+        self.key = key
+        self.n_feats = n_feats
+        self.seed = seed
+        self.pop_size = pop
+        self.generations = gen
+        self.cxpb = cxpb
+        self.mutpb = mutpb
+        self.usf = usf
+        self.mlnp = mlnp
+        self.job_id = (f"{key}|seed={seed}|pop={pop}|gen={gen}|cxpb={cxpb}"
+                       f"|mutpb={mutpb}|usf={int(usf)}|mlnp={int(mlnp)}")
+
+        self.rng = random.Random(seed)
+        make_folds(n_recs, rng=self.rng)  # consume the shuffle exactly like the workers do
+        self.pop = [[self.rng.random() < 0.5 for _ in range(n_feats)] for _ in range(pop)]
+        self.gen = 1
+        self.scores: List[Optional[float]] = [None] * pop
+        self.pending = pop
+        self.best_mask: List[bool] = []
+        self.best_score = -1.0
+        self.evaluations = 0
+        self.started = time.time()
+
+    def tasks(self):
+        return [(self.job_id, i, self.key, self.seed, self.mlnp, self.usf, mask)
+                for i, mask in enumerate(self.pop)]
+
+    def deliver(self, idx: int, score: float) -> bool:
+        """Stores one fitness value; returns True once the generation is complete."""
+        self.scores[idx] = score
+        self.evaluations += 1
+        self.pending -= 1
+        return self.pending == 0
+
+    def advance(self) -> bool:
+        """Closes the current generation; returns False when the job is finished."""
+        scores = self.scores
+        i_best = max(range(len(scores)), key=lambda i: scores[i])
+        if scores[i_best] > self.best_score:
+            self.best_score = scores[i_best]
+            self.best_mask = self.pop[i_best].copy()
+        if self.gen >= self.generations:
+            return False
+        self.pop = evolve_population(self.pop, scores, self.cxpb, self.mutpb, self.rng)
+        self.gen += 1
+        self.scores = [None] * self.pop_size
+        self.pending = self.pop_size
+        return True
+
+    def result_row(self) -> List[str]:
+        return [
+            self.job_id, self.key, str(self.seed), str(self.pop_size), str(self.generations),
+            str(self.cxpb), str(self.mutpb), str(int(self.usf)), str(int(self.mlnp)),
+            f"{self.best_score:.6f}", str(sum(self.best_mask)), str(self.n_feats),
+            str(self.evaluations), f"{time.time() - self.started:.3f}",
+            ''.join('1' if b else '0' for b in self.best_mask),
+        ]
+
+def read_finished_jobs(path: str) -> set:
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r') as f:
+        for line in f:
+            cols = line.rstrip('\n').split('\t')
+            if cols and cols[0] != 'job' and len(cols) == len(RESULT_COLUMNS):
+                done.add(cols[0])
+    return done
+
+def dataset_key(path: str) -> str:
+    """File name plus a content hash, so a replaced or re-discretized file does not match finished jobs."""
+    return f"{path.split('/')[-1]}@{file_hash(path)[:12]}"
+
+def build_jobs(datasets, seeds, pops, gens, cxpbs, mutpbs, usfs, mlnps) -> List[SweepJob]:
+    jobs = []
+    for key, seed, pop, gen, cxpb, mutpb, usf, mlnp in itertools.product(
+            datasets, seeds, pops, gens, cxpbs, mutpbs, usfs, mlnps):
+        _, names, recs = datasets[key]
+        jobs.append(SweepJob(key, len(recs), len(names) - 1, seed, pop, gen,
+                             cxpb, mutpb, usf, mlnp))
+    return jobs
+
+def run_sweep(datasets, jobs: List[SweepJob], results_path: str,
+              processes: Optional[int] = None, max_active: Optional[int] = None,
+              cache_size: int = CACHE_SIZE):
+    """
+    Interleaves the fitness tasks of all jobs on one long-lived pool. A job
+    evolves as soon as its own generation is complete, so no job waits for the
+    slowest one and the pool never drains between runs.
+    """
+    processes = processes or cpu_count()
+    max_active = max_active or 2 * processes
+    waiting = list(reversed(jobs))
+    active: Dict[str, SweepJob] = {}
+    results: queue.Queue = queue.Queue()
+    new_file = not os.path.exists(results_path)
+
+    with open(results_path, 'a') as fout, \
+         Pool(processes, initializer=init_sweep_worker, initargs=(datasets, cache_size)) as pool:
+        if new_file:
+            fout.write('\t'.join(RESULT_COLUMNS) + '\n')
+            fout.flush()
+
+        def submit(job):
+            for task in job.tasks():
+                pool.apply_async(sweep_fitness_worker, (task,),
+                                 callback=results.put, error_callback=results.put)
+
+        while waiting or active:
+            while waiting and len(active) < max_active:
+                job = waiting.pop()
+                active[job.job_id] = job
+                submit(job)
+
+            res = results.get()
+            if isinstance(res, BaseException):
+                raise res
+            job_id, idx, score = res
+            job = active[job_id]
+            if not job.deliver(idx, score):
+                continue
+            if job.advance():
+                submit(job)
+                continue
+
+            del active[job_id]
+            row = job.result_row()
+            fout.write('\t'.join(row) + '\n')
+            fout.flush()
+            print(f"{row[9]}\t{row[10]}/{row[11]}\t{job_id}")
+
+def main():
+    p = ArgumentParser(description="Run a dataset x seed x hyperparameter grid on one worker pool.")
+    p.add_argument('--train',   nargs='+', required=True, help="ARFF files used for 5-fold CV")
+    p.add_argument('--seeds',   nargs='+', type=int,   default=[0])
+    p.add_argument('--pop',     nargs='+', type=int,   default=[20])
+    p.add_argument('--gen',     nargs='+', type=int,   default=[40])
+    p.add_argument('--cxpb',    nargs='+', type=float, default=[0.7])
+    p.add_argument('--mutpb',   nargs='+', type=float, default=[0.2])
+    p.add_argument('--usf',     nargs='+', type=int,   default=[0], choices=[0, 1], help="use log-usefulness")
+    p.add_argument('--mlnp',    nargs='+', type=int,   default=[1], choices=[0, 1], help="mandatory leaf nodes")
+    p.add_argument('--results', type=str, default='sweep_results.tsv', help="results table (resumable)")
+    p.add_argument('--procs',   type=int, default=None, help="worker processes (default: all cores)")
+    p.add_argument('--max-active', type=int, default=None, help="jobs running at once (default: 2 x procs)")
+    p.add_argument('--worker-cache', type=int, default=CACHE_SIZE,
+                   help="fold splits and evaluators each worker keeps (least recently used are dropped)")
+    args = p.parse_args()
+
+    datasets = {}
+    for path in args.train:
+        key = dataset_key(path)
+        if key in datasets:
+            sys.stderr.write(f"[ERR] Duplicate dataset name {key}\n")
+            sys.exit(1)
+        datasets[key] = parse_arff(path)
+
+    jobs = build_jobs(datasets, args.seeds, args.pop, args.gen, args.cxpb, args.mutpb,
+                      [bool(v) for v in args.usf], [bool(v) for v in args.mlnp])
+    done = read_finished_jobs(args.results)
+    todo = [job for job in jobs if job.job_id not in done]
+    print(f"{len(jobs)} jobs, {len(jobs) - len(todo)} already in {args.results}, {len(todo)} to run.")
+    if todo:
+        run_sweep(datasets, todo, args.results, args.procs, args.max_active, args.worker_cache)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#! MIT License
+#!
+#! Copyright (c) 2025 Santos O. G., Helen C. S. C. Lima,
+#! Permission is hereby granted, free of charge, to any person obtaining a copy
+#! of this software and associated documentation files (the "Software"), to deal
+#! in the Software without restriction, including without limitation the rights
+#! to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#! copies of the Software, and to permit persons to whom the Software is
+#! furnished to do so, subject to the following conditions:
+#!
+#! The above copyright notice and this permission notice shall be included in all
+#! copies or substantial portions of the Software.
+
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+def process_rss_bytes() -> int:
+    """
+    Returns the resident set size of the calling process in bytes.
+    Reads /proc when available, falls back to the peak RSS from getrusage
+    (reported in bytes on macOS, in kilobytes elsewhere).
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    except (ImportError, ValueError):
+        return 0
+
+def population_diversity(pop: List[List[bool]]) -> float:
+    """
+    Mean pairwise Hamming distance of the population, normalized to [0, 1].
+    Computed from per-bit frequencies, so it is linear in the population size.
+    """
+    n = len(pop)
+    if n < 2 or not pop[0]:
+        return 0.0
+    n_feats = len(pop[0])
+    ones = [0] * n_feats
+    for individual in pop:
+        for idx, bit in enumerate(individual):
+            if bit:
+                ones[idx] += 1
+    pairs = n * (n - 1) / 2
+    dist = sum(c * (n - c) for c in ones) / pairs
+    return dist / n_feats
+
+class Telemetry:
+    """
+    Collects one record per generation, appends it to a JSONL file and
+    mirrors the counters on an optional localhost Prometheus endpoint.
+    """
+
+    def __init__(self, jsonl_path: Optional[str], metrics_port: Optional[int], dataset: str):
+        self.jsonl_path = jsonl_path
+        self.metrics_port = metrics_port
+        self.dataset = dataset
+        self.start = time.time()
+        self.evaluations_total = 0
+        self.busy_total: Dict[int, float] = {}
+        self.last: Dict = {}
+
+        self._lock = threading.Lock()
+        self._fout = None
+        self._server = None
+
+    def open(self):
+        """Opens the JSONL file and the metrics server; on OSError closes what was opened and re-raises."""
+        try:
+            if self.jsonl_path:
+                parent = os.path.dirname(self.jsonl_path)
+                if parent:
+                    os.makedirs(parent, exist_ok=True)
+                self._fout = open(self.jsonl_path, 'a')
+            if self.metrics_port is not None:
+                self._server = MetricsServer(self, self.metrics_port)
+                self._server.start()
+        except OSError:
+            self.close()
+            raise
+
+    def metrics_url(self) -> Optional[str]:
+        """Address the metrics endpoint is bound to (the real port when 0 was asked for)."""
+        if self._server is None:
+            return None
+        return f"http://127.0.0.1:{self._server.port}/metrics"
+
+    def close(self):
+        if self._fout:
+            self._fout.close()
+            self._fout = None
+        if self._server:
+            self._server.stop()
+            self._server = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_generation(self, gen: int, scores: List[float], pop: List[List[bool]],
+                          timings: List[tuple], dispatched: float, finished: float,
+                          best_score: float, extra_evaluations: int = 0,
+                          fields: Optional[Dict] = None, reused: int = 0) -> Dict:
+        """
+        Builds the record for one generation.
+        `timings` holds one (pid, started, ended, rss) tuple per task as
+        reported by the workers; `dispatched`/`finished` bracket the pool calls.
+        `extra_evaluations` counts evaluations beyond `scores` (e.g. local search)
+        and `fields` adds optional entries to the record (e.g. surrogate accuracy).
+        `reused` of all those scores were taken from a results store; they are
+        reported apart and not counted as evaluations.
+        """
+        wall = max(finished - dispatched, 1e-9)
+        n_evals = len(scores) + extra_evaluations - reused
+        busy: Dict[int, float] = {}
+        rss: Dict[int, int] = {os.getpid(): process_rss_bytes()}
+        waits = []
+        for pid, started, ended, worker_rss in timings:
+            busy[pid] = busy.get(pid, 0.0) + (ended - started)
+            rss[pid] = worker_rss
+            waits.append(max(0.0, started - dispatched))
+
+        with self._lock:
+            self.evaluations_total += n_evals
+            for pid, secs in busy.items():
+                self.busy_total[pid] = self.busy_total.get(pid, 0.0) + secs
+            record = {
+                'gen': gen,
+                'dataset': self.dataset,
+                'evaluations': n_evals,
+                'evaluations_total': self.evaluations_total,
+                'reused': reused,
+                'evals_per_sec': n_evals / wall,
+                'gen_seconds': wall,
+                'worker_busy_seconds': {str(pid): secs for pid, secs in busy.items()},
+                'queue_wait_mean': sum(waits) / len(waits) if waits else 0.0,
+                'queue_wait_max': max(waits, default=0.0),
+                'diversity': population_diversity(pop),
+                'fitness_best': max(scores),
+                'fitness_avg': sum(scores) / len(scores),
+                'fitness_min': min(scores),
+                'best_score': best_score,
+                'rss_bytes': {str(pid): val for pid, val in rss.items()},
+                'elapsed': finished - self.start,
+            }
+            record.update(fields or {})
+            self.last = record
+            if self._fout:
+                self._fout.write(json.dumps(record) + '\n')
+                self._fout.flush()
+        return record
+
+    def render_prometheus(self) -> str:
+        """Exposes the latest record in the Prometheus text format."""
+        with self._lock:
+            rec = dict(self.last)
+            busy_total = dict(self.busy_total)
+            evaluations_total = self.evaluations_total
+        ds = self.dataset.replace('\\', '\\\\').replace('"', '\\"')
+        out = []
+
+        def metric(name, kind, help_text, samples):
+            out.append(f"# HELP mpfs_ga_{name} {help_text}\n")
+            out.append(f"# TYPE mpfs_ga_{name} {kind}\n")
+            for labels, value in samples:
+                lbl = ','.join([f'dataset="{ds}"'] + [f'{k}="{v}"' for k, v in labels])
+                out.append(f"mpfs_ga_{name}{{{lbl}}} {value}\n")
+
+        metric('evaluations_total', 'counter', "Fitness evaluations performed.",
+               [((), evaluations_total)])
+        metric('worker_busy_seconds_total', 'counter', "Time each worker spent evaluating.",
+               [((('pid', pid),), secs) for pid, secs in sorted(busy_total.items())])
+        metric('elapsed_seconds', 'gauge', "Seconds since the run started.",
+               [((), rec.get('elapsed', time.time() - self.start))])
+        if rec:
+            metric('generation', 'gauge', "Last completed generation.", [((), rec['gen'])])
+            metric('evals_per_second', 'gauge', "Evaluation throughput of the last generation.",
+                   [((), rec['evals_per_sec'])])
+            metric('queue_wait_seconds', 'gauge', "Delay between dispatch and evaluation start.",
+                   [((('stat', 'mean'),), rec['queue_wait_mean']),
+                    ((('stat', 'max'),), rec['queue_wait_max'])])
+            metric('diversity', 'gauge', "Normalized mean pairwise Hamming distance.",
+                   [((), rec['diversity'])])
+            metric('fitness', 'gauge', "Fitness of the last evaluated population.",
+                   [((('stat', 'best'),), rec['fitness_best']),
+                    ((('stat', 'avg'),), rec['fitness_avg']),
+                    ((('stat', 'min'),), rec['fitness_min'])])
+            metric('best_score', 'gauge', "Best fitness found so far.", [((), rec['best_score'])])
+            metric('rss_bytes', 'gauge', "Resident set size per process.",
+                   [((('pid', pid),), val) for pid, val in sorted(rec['rss_bytes'].items())])
+        return ''.join(out)
+
+class MetricsServer:
+    """Serves Telemetry.render_prometheus() on 127.0.0.1:<port>/metrics."""
+
+    def __init__(self, telemetry: Telemetry, port: int):
+        self.telemetry = telemetry
+        self.port = port
+        self._httpd = None
+        self._thread = None
+
+    def start(self):
+        telemetry = self.telemetry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = telemetry.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -1,5 +1,29 @@
 # tests/conftest.py
 
 import sys, os
+import random
+import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+def write_toy_arff(path, n_rows=120, n_attrs=12, n_values=4, seed=1):
+    """Writes a small discretized hierarchical ARFF where the first attributes track the class."""
+    rng = random.Random(seed)
+    classes = ['01', '01.1', '01.2', '02', '02.1', '02.1.3', '03']
+    leaves = ['01.1', '01.2', '02.1', '02.1.3', '03']
+    with open(path, 'w') as f:
+        f.write("@relation 'toy'\n\n")
+        for i in range(n_attrs):
+            f.write(f"@attribute A{i} {{{','.join(str(v) for v in range(n_values))}}}\n")
+        f.write("@attribute class {" + ','.join(classes) + "}\n@data\n")
+        for _ in range(n_rows):
+            cls = rng.choice(leaves)
+            k = leaves.index(cls)
+            row = [str((k + rng.randrange(2)) % n_values) if i < 3 else str(rng.randrange(n_values))
+                   for i in range(n_attrs)]
+            f.write(','.join(row) + ',' + cls + '\n')
+    return str(path)
+
+@pytest.fixture
+def toy_arff(tmp_path):
+    return write_toy_arff(tmp_path / "toy.arff")
@@ -0,0 +1,54 @@
+import random
+import pytest
+from main import parse_arff, make_folds, evaluate_mask
+from dataset import EncodedDataset
+from batch import BatchEvaluator, BatchTuner, lpt_batches
+
+@pytest.mark.parametrize("usf", [False, True])
+def test_batch_matches_text_pipeline(toy_arff, usf):
+    header, names, recs = parse_arff(toy_arff)
+    folds = make_folds(len(recs), rng=random.Random(0))
+    rng = random.Random(7)
+    masks = [[rng.random() < 0.5 for _ in range(len(names) - 1)] for _ in range(8)]
+    evaluator = BatchEvaluator(EncodedDataset(header, names, recs), folds, usf)
+    expected = [evaluate_mask(header, names, recs, folds, m, True, usf) for m in masks]
+    assert evaluator.evaluate(masks) == expected
+
+def test_lpt_balances_costs():
+    costs = [7, 5, 4, 4, 3, 3, 2]
+    bins = lpt_batches(costs, 3)
+    assert sorted(i for b in bins for i in b) == list(range(len(costs)))
+    loads = [sum(costs[i] for i in b) for b in bins]
+    assert loads == sorted(loads, reverse=True)
+    assert max(loads) - min(loads) <= max(costs)
+
+def test_tuner_settles_on_fastest_factor():
+    tuner = BatchTuner(4, max_factor=4, revisit=100)
+    speed = {1: 10.0, 2: 40.0, 4: 20.0}
+    for _ in range(6):
+        tuner.observe(100, 100 / speed[tuner.factor])
+    assert tuner.factor == 2
+    assert tuner.n_batches(5) == 5
+
+def test_fold_units_match_single_fold_scores(toy_arff):
+    header, names, recs = parse_arff(toy_arff)
+    folds = make_folds(len(recs), rng=random.Random(0))
+    rng = random.Random(3)
+    masks = [[rng.random() < 0.5 for _ in range(len(names) - 1)] for _ in range(3)]
+    units = [(fid, m) for m in masks for fid in reversed(range(len(folds)))]
+    evaluator = BatchEvaluator(EncodedDataset(header, names, recs), folds, False)
+    expected = [evaluate_mask(header, names, recs, [folds[fid]], m, True, False) for fid, m in units]
+    assert evaluator.evaluate_units(units) == expected
+
+def test_weighted_unique_rows_keep_hf(tmp_path):
+    from conftest import write_toy_arff
+    path = write_toy_arff(tmp_path / "dup.arff", n_rows=200, n_attrs=4, n_values=2)
+    header, names, recs = parse_arff(path)
+    dataset = EncodedDataset(header, names, recs)
+    unique, weights = dataset.collapse(range(dataset.n_rows))
+    assert len(unique) == dataset.n_unique < dataset.n_rows and sum(weights) == dataset.n_rows
+    folds = make_folds(len(recs), rng=random.Random(0))
+    masks = [[True, False, True, False], [False, True, True, True], [True] * 4]
+    expected = [evaluate_mask(header, names, recs, folds, m, True, False) for m in masks]
+    for collapse in (False, True):
+        assert BatchEvaluator(dataset, folds, False, collapse=collapse).evaluate(masks) == expected
@@ -0,0 +1,58 @@
+import random
+import pytest
+import codegen
+from main import parse_arff, make_folds, evaluate_mask
+from dataset import EncodedDataset
+from batch import BatchEvaluator, FoldModel
+from codegen import SpecializedFold
+
+@pytest.mark.parametrize("unroll_limit", [codegen.UNROLL_LIMIT, 0])
+def test_specialized_scores_match_generic(toy_arff, monkeypatch, unroll_limit):
+    monkeypatch.setattr(codegen, "UNROLL_LIMIT", unroll_limit)
+    monkeypatch.setattr(codegen, "_FACTORIES", {})
+    header, names, recs = parse_arff(toy_arff)
+    dataset = EncodedDataset(header, names, recs)
+    rng = random.Random(4)
+    selections = [[]] + [[a for a in range(dataset.n_feats) if rng.random() < 0.5] for _ in range(6)]
+    for train, valid in make_folds(len(recs), rng=random.Random(0)):
+        model = FoldModel(dataset, train, valid, True)
+        special = SpecializedFold(model)
+        assert [special.score(sel) for sel in selections] == [model.score(sel) for sel in selections]
+    empty = SpecializedFold(FoldModel(dataset, [], list(range(10)), False))
+    assert empty.score([0, 1]) == FoldModel(dataset, [], list(range(10)), False).score([0, 1])
+
+def test_specialized_evaluator_matches_text_pipeline(toy_arff):
+    header, names, recs = parse_arff(toy_arff)
+    folds = make_folds(len(recs), rng=random.Random(0))
+    rng = random.Random(9)
+    masks = [[rng.random() < 0.5 for _ in range(len(names) - 1)] for _ in range(5)]
+    evaluator = BatchEvaluator(EncodedDataset(header, names, recs), folds, False, specialize=True)
+    expected = [evaluate_mask(header, names, recs, folds, m, True, False) for m in masks]
+    assert evaluator.evaluate(masks) == expected
+    assert evaluator.evaluate(masks) == expected
+
+@pytest.mark.parametrize("unroll_limit", [10 ** 6, 0])
+def test_wide_selection_compiles(tmp_path, monkeypatch, unroll_limit):
+    from conftest import write_toy_arff
+    monkeypatch.setattr(codegen, "UNROLL_LIMIT", unroll_limit)
+    monkeypatch.setattr(codegen, "_FACTORIES", {})
+    header, names, recs = parse_arff(write_toy_arff(tmp_path / "wide.arff", n_rows=40, n_attrs=3000))
+    dataset = EncodedDataset(header, names, recs)
+    train, valid = make_folds(len(recs), rng=random.Random(0))[0]
+    model = FoldModel(dataset, train, valid, False)
+    selected = list(range(dataset.n_feats))
+    assert SpecializedFold(model).score(selected) == model.score(selected)
+
+def test_cache_is_bounded_by_source_size(toy_arff, monkeypatch):
+    monkeypatch.setattr(codegen, "_FACTORIES", {})
+    monkeypatch.setattr(codegen, "_cached_size", 0)
+    monkeypatch.setattr(codegen, "CACHE_BUDGET", 3000)
+    header, names, recs = parse_arff(toy_arff)
+    dataset = EncodedDataset(header, names, recs)
+    train, valid = make_folds(len(recs), rng=random.Random(0))[0]
+    model = FoldModel(dataset, train, valid, False)
+    special = SpecializedFold(model)
+    for a in range(dataset.n_feats):
+        assert special.score([a]) == model.score([a])
+        assert codegen._cached_size <= codegen.CACHE_BUDGET
+    assert len(special._scorers) < dataset.n_feats
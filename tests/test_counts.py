@@ -0,0 +1,52 @@
+import random
+import pytest
+from main import parse_arff, make_folds
+from dataset import EncodedDataset
+from counts import CountTable, count_file, count_appended
+
+def test_shards_merge_to_single_pass(toy_arff):
+    header, names, recs = parse_arff(toy_arff)
+    dataset = EncodedDataset(header, names, recs)
+    single = count_file(toy_arff)
+    assert single == CountTable.from_rows(dataset, range(len(recs)))
+    assert count_file(toy_arff, shards=7) == single
+    assert single.n_rows == len(recs)
+
+def test_appended_rows_update_without_recount(tmp_path, toy_arff):
+    with open(toy_arff) as f:
+        lines = f.readlines()
+    head = len(lines) - 30
+    path = tmp_path / "grow.arff"
+    path.write_text(''.join(lines[:head]))
+    table = count_file(str(path))
+    with open(path, 'a') as f:
+        f.write(''.join(lines[head:]))
+    assert count_appended(table, str(path)) == 30
+    assert table == count_file(toy_arff)
+    assert count_appended(table, str(path)) == 0
+
+def test_fold_counts_are_total_minus_validation(toy_arff):
+    header, names, recs = parse_arff(toy_arff)
+    dataset = EncodedDataset(header, names, recs)
+    total = CountTable.from_rows(dataset, range(len(recs)))
+    for train, valid in make_folds(len(recs), rng=random.Random(0)):
+        fold = total - CountTable.from_rows(dataset, valid)
+        assert fold == CountTable.from_rows(dataset, train)
+    with pytest.raises(ValueError):
+        CountTable.from_rows(dataset, [0]) - total
+
+def test_evaluator_counts_take_appended_rows(tmp_path, toy_arff):
+    from batch import BatchEvaluator
+    with open(toy_arff) as f:
+        lines = f.readlines()
+    path = tmp_path / "grow.arff"
+    path.write_text(''.join(lines[:-30]))
+    header, names, recs = parse_arff(str(path))
+    with pytest.raises(ValueError, match="no file offset"):
+        count_appended(CountTable.from_rows(EncodedDataset(header, names, recs), range(len(recs))), str(path))
+    dataset = EncodedDataset(header, names, recs, path.stat().st_size)
+    table = BatchEvaluator(dataset, make_folds(len(recs), rng=random.Random(0)), False).total_counts()
+    with open(path, 'a') as f:
+        f.write(''.join(lines[-30:]))
+    assert count_appended(table, str(path)) == 30
+    assert table == count_file(toy_arff)
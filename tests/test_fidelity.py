@@ -0,0 +1,41 @@
+import random
+from collections import Counter
+from main import parse_arff, make_folds, evaluate_mask
+from dataset import EncodedDataset
+from batch import BatchEvaluator
+from fidelity import FidelitySchedule, stratified_ranks, level_folds, without_fidelity
+
+def test_subsamples_are_nested_and_stratified(toy_arff):
+    _, _, recs = parse_arff(toy_arff)
+    folds = make_folds(len(recs), rng=random.Random(0))
+    ranks = stratified_ranks([rec[-1] for rec in recs])
+    small = level_folds(folds, ranks, (0.3, 2))
+    large = level_folds(folds, ranks, (0.6, 2))
+    assert len(small) == 2 and level_folds(folds, ranks, None) is folds
+    for (st, sv), (lt, lv), (ft, fv) in zip(small, large, folds):
+        assert set(st) <= set(lt) <= set(ft) and set(sv) <= set(lv) <= set(fv)
+    kept = Counter(recs[r][-1] for r in small[0][0] + small[0][1])
+    total = Counter(rec[-1] for rec in recs)
+    assert all(abs(kept[c] - 0.3 * total[c]) <= 1 for c in total)
+
+def test_schedule_ramps_and_latches_on_convergence():
+    schedule = FidelitySchedule(0.25, 2, 5, 5, converge_at=0.05)
+    levels = [schedule.level(gen, 0.4) for gen in range(1, 4)]
+    assert levels[0] == (0.3, 2)
+    assert [l[0] for l in levels] == sorted(l[0] for l in levels)
+    assert schedule.level(4, 0.01) is None and schedule.full_since == 4
+    assert schedule.level(5, 0.4) is None
+
+def test_level_scores_match_text_pipeline(toy_arff):
+    header, names, recs = parse_arff(toy_arff)
+    folds = level_folds(make_folds(len(recs), rng=random.Random(0)),
+                        stratified_ranks([rec[-1] for rec in recs]), (0.5, 3))
+    rng = random.Random(2)
+    masks = [[rng.random() < 0.5 for _ in range(len(names) - 1)] for _ in range(4)]
+    evaluator = BatchEvaluator(EncodedDataset(header, names, recs), folds, False)
+    assert evaluator.evaluate(masks) == [evaluate_mask(header, names, recs, folds, m, True, False)
+                                         for m in masks]
+
+def test_full_run_keeps_ga_options_only():
+    argv = ['--pop', '8', '--fidelity-start', '0.3', '--gen', '4', '--fidelity-folds=2', '--usf']
+    assert without_fidelity(argv) == ['--pop', '8', '--gen', '4', '--usf']
@@ -0,0 +1,27 @@
+import random
+import sqlite3
+import main
+from main import parse_arff, make_folds, evaluate_mask
+from projection import read_attribute_names
+
+def test_reported_best_is_a_full_fidelity_score(toy_arff, tmp_path, monkeypatch, capsys):
+    db, out = str(tmp_path / "results.db"), str(tmp_path / "out")
+    argv = ['main.py', '--train', toy_arff, '--pop', '8', '--gen', '6', '--out', out, '--store', db,
+            '--fidelity-start', '0.4', '--fidelity-folds', '2', '--fidelity-full-gen', '4',
+            '--surrogate', '--surrogate-warmup', '8', '--memetic-every', '2', '--memetic-budget', '6']
+    for _ in range(2):  # the second run reuses and warm-starts from the store
+        monkeypatch.setattr('sys.argv', argv)
+        main.main()
+    printed = capsys.readouterr().out
+
+    header, names, recs = parse_arff(toy_arff)
+    kept = set(read_attribute_names(f"{out}/train_opt.arff"))
+    mask = [nm in kept for nm in names[:-1]]
+    random.seed(0)
+    folds = make_folds(len(recs))
+    expected = evaluate_mask(header, names, recs, folds, mask, True, False)
+    best, best_mask = sqlite3.connect(db).execute(
+        "SELECT best, best_mask FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+    assert best == expected and best_mask == ''.join('1' if b else '0' for b in mask)
+    assert f"Best = {expected:.4f} with {sum(mask)}/{len(mask)} attributes" in printed
+    assert "fidelity: full" in printed and "evaluations saved by stored scores" in printed
@@ -0,0 +1,39 @@
+import random
+from memetic import hill_climb, refine_elites
+
+TARGET = [True, False, True, True, False, False, True, False]
+
+def onemax(masks):
+    return [float(sum(a == b for a, b in zip(m, TARGET))) for m in masks]
+
+def test_best_improvement_reaches_optimum():
+    start = [not b for b in TARGET]
+    mask, score, used = hill_climb(start, onemax([start])[0], onemax, 1000, 'best', random.Random(1))
+    assert mask == TARGET and score == len(TARGET)
+    assert used <= (len(TARGET) + 1) * len(TARGET)
+
+def test_refine_elites_respects_budget():
+    rng = random.Random(2)
+    pop = [[rng.random() < 0.5 for _ in TARGET] for _ in range(6)]
+    scores = onemax(pop)
+    calls = []
+    def counted(masks):
+        calls.append(len(masks))
+        return onemax(masks)
+    used, improved = refine_elites(pop, scores, 3, 10, counted, 'first', rng)
+    assert used == sum(calls) <= 10
+    assert scores == onemax(pop)
+
+def test_steps_skip_undo_and_first_stops_early():
+    seen = []
+    def recorded(masks):
+        seen.extend(tuple(m) for m in masks)
+        return onemax(masks)
+    start = [not b for b in TARGET]
+    mask, score, used = hill_climb(start, onemax([start])[0], recorded, 1000, 'best', random.Random(3))
+    assert mask == TARGET and used == len(seen)
+    assert tuple(start) not in seen
+    assert used <= len(TARGET) + (len(TARGET) - 1) * len(TARGET)
+
+    _, _, first_used = hill_climb(start, onemax([start])[0], onemax, 1000, 'first', random.Random(3), chunk=2)
+    assert first_used < used
@@ -0,0 +1,62 @@
+import os
+import random
+import pytest
+from conftest import write_toy_arff
+from classifier import nbayes
+from main import parse_arff, make_folds, evaluate_mask
+import native
+
+HERE = os.path.dirname(__file__)
+
+@pytest.fixture(scope="module")
+def lib():
+    lib = native.load_library()
+    if lib is None:
+        pytest.skip(f"native library unavailable: {native.load_error()}")
+    return lib
+
+def _pairs(tmp_path):
+    pairs = [(write_toy_arff(tmp_path / "train.arff", seed=1),
+              write_toy_arff(tmp_path / "test.arff", n_rows=60, seed=2))]
+    for suffix in ("a", "b"):
+        train = os.path.join(HERE, "datasets", "train", f"train_{suffix}.arff")
+        test = os.path.join(HERE, "datasets", "test", f"test_{suffix}.arff")
+        if os.path.exists(train) and os.path.exists(test):
+            pairs.append((train, test))
+    return pairs
+
+@pytest.mark.parametrize("usf", [False, True])
+def test_parity_with_nbayes(lib, tmp_path, usf):
+    for train_file, test_file in _pairs(tmp_path):
+        header, names, train = parse_arff(train_file)
+        _, _, test = parse_arff(test_file)
+        folds = [(list(range(len(train))), list(range(len(train), len(train) + len(test))))]
+        scorer = native.make_scorer(header, names, train + test, folds, usf)
+        expected = nbayes(False, usf, train_file, test_file, "")
+        assert scorer.score([[True] * (len(names) - 1)]) == [expected]
+
+def test_parity_with_cross_validation(lib, toy_arff):
+    header, names, recs = parse_arff(toy_arff)
+    folds = make_folds(len(recs), rng=random.Random(0))
+    rng = random.Random(5)
+    masks = [[rng.random() < 0.5 for _ in range(len(names) - 1)] for _ in range(6)]
+    scorer = native.make_scorer(header, names, recs, folds, False)
+    expected = [evaluate_mask(header, names, recs, folds, m, True, False) for m in masks]
+    assert scorer.score(masks) == expected
+
+def test_fold_tables_are_prepared_once(lib, toy_arff):
+    header, names, recs = parse_arff(toy_arff)
+    folds = make_folds(len(recs), rng=random.Random(0))
+    rng = random.Random(6)
+    masks = [[rng.random() < 0.5 for _ in range(len(names) - 1)] for _ in range(4)]
+    scorer = native.make_scorer(header, names, recs, folds, False)
+    for m in masks:
+        assert scorer.fold_score([m], 2) == [evaluate_mask(header, names, recs, [folds[2]], m, True, False)]
+    assert list(scorer._tables) == [2]
+
+def test_abi_mismatch_is_rejected(lib, monkeypatch):
+    monkeypatch.setattr(native, '_LIB', None)
+    monkeypatch.setattr(native, '_LOAD_ERROR', None)
+    monkeypatch.setattr(native, 'ABI_VERSION', native.ABI_VERSION + 1)
+    assert native.load_library(build=False) is None
+    assert "ABI version" in native.load_error()
@@ -0,0 +1,17 @@
+from main import parse_arff, build_arff_text
+from projection import project_arff, mask_to_names
+
+def test_streaming_projection_matches_in_memory_text(toy_arff, tmp_path):
+    header, names, recs = parse_arff(toy_arff)
+    mask = [i % 3 == 0 for i in range(len(names) - 1)]
+    out = tmp_path / "train_opt.arff"
+    rows = project_arff(toy_arff, str(out), mask_to_names(names, mask))
+    assert rows == len(recs)
+    assert out.read_text() == build_arff_text(header, names, recs, mask)
+
+def test_empty_selection_keeps_class_column(toy_arff, tmp_path):
+    out = tmp_path / "only_class.arff"
+    project_arff(toy_arff, str(out), set())
+    header, data = out.read_text().split('@data\n')
+    assert header.count('@attribute') == 1
+    assert data and all(',' not in line for line in data.split())
@@ -0,0 +1,17 @@
+import pytest
+from utils import get_datasets_profile
+from ranking import rank_attributes, mutation_rates, seed_population
+
+@pytest.mark.parametrize("method", ["su", "hmi"])
+def test_informative_attributes_rank_first(toy_arff, method):
+    n_recs, _, n_attrs = get_datasets_profile(toy_arff, toy_arff)
+    scores = rank_attributes(toy_arff, n_recs, n_attrs, True, method)
+    assert len(scores) == n_attrs - 1
+    top3 = sorted(range(len(scores)), key=lambda i: -scores[i])[:3]
+    assert sorted(top3) == [0, 1, 2]
+
+def test_mutation_rates_keep_average():
+    on, off = mutation_rates([0.1, 0.5, 0.9, 0.3], 0.2, 0.5)
+    assert sum(on) / len(on) == pytest.approx(0.2)
+    assert on[2] > on[0] and off[2] < off[0]
+    assert len(seed_population([0.1, 0.5], 3)) == 3
@@ -0,0 +1,26 @@
+import sqlite3
+from store import ResultsStore, split_hash, mask_key
+
+def test_scores_are_reused_per_dataset_split_and_flags(tmp_path):
+    path = str(tmp_path / "results.db")
+    masks = [[True, False, True], [False, True, True], [True, True, True]]
+    folds = [([1, 2], [0]), ([0, 2], [1])]
+    with ResultsStore(path, 'abc', split_hash(folds), False, True) as store:
+        store.record(masks, [70.0, 80.0, 75.0])
+        store.record(masks[:1], [10.0])  # first score wins
+        assert store.recorded == 3
+        run = store.record_run({'pop': 3}, 80.0, masks[1], 3, [(masks[1], 80.0), (masks[2], 75.0)])
+
+    with ResultsStore(path, 'abc', split_hash(folds), False, True) as store:
+        assert store.best_masks(2) == [masks[1], masks[2]]
+        found = store.lookup(masks + [[False, False, True]])
+        assert found == {mask_key(masks[0]): 70.0, mask_key(masks[1]): 80.0, mask_key(masks[2]): 75.0}
+        assert store.reused == 3
+    with ResultsStore(path, 'abc', split_hash(folds[::-1]), False, True) as store:
+        assert store.lookup(masks) == {} and store.best_masks(5) == []
+    with ResultsStore(path, 'abc', split_hash(folds), True, True) as store:
+        assert store.lookup(masks) == {}
+
+    db = sqlite3.connect(path)
+    assert db.execute("SELECT mask FROM fronts WHERE run=? ORDER BY position", (run,)).fetchall() == \
+        [('011',), ('111',)]
@@ -0,0 +1,18 @@
+import random
+import pytest
+from surrogate import RidgeSurrogate, select_for_evaluation, accuracy
+
+def test_online_ridge_learns_additive_fitness():
+    rng = random.Random(0)
+    weights = [3.0, -2.0, 0.5, 0.0, 1.5]
+    model = RidgeSurrogate(len(weights), reg=1e-3)
+    for _ in range(200):
+        mask = [rng.random() < 0.5 for _ in weights]
+        model.update(mask, 10.0 + sum(w for w, keep in zip(weights, mask) if keep))
+    assert model.predict([True, False, False, False, True]) == pytest.approx(14.5, abs=1e-2)
+
+def test_selection_mixes_best_and_exploration():
+    preds = [5.0, 1.0, 9.0, 7.0, 3.0, 2.0]
+    chosen = select_for_evaluation(preds, 3, 1, random.Random(1))
+    assert len(chosen) == 3 and 2 in chosen and 3 in chosen
+    assert accuracy([1.0, 2.0, 3.0], [10.0, 20.0, 30.0])["spearman"] == pytest.approx(1.0)
@@ -0,0 +1,46 @@
+from main import parse_arff, make_folds, evaluate_mask
+from sweep import SweepJob, RESULT_COLUMNS, read_finished_jobs, dataset_key
+import random
+
+def test_job_runs_all_generations(toy_arff):
+    header, names, recs = parse_arff(toy_arff)
+    job = SweepJob("toy.arff", len(recs), len(names) - 1, 3, 4, 2, 0.7, 0.2, False, True)
+    folds = make_folds(len(recs), rng=random.Random(3))
+    generations = 0
+    while True:
+        generations += 1
+        done = False
+        for job_id, idx, key, seed, mlnp, usf, mask in job.tasks():
+            done = job.deliver(idx, evaluate_mask(header, names, recs, folds, mask, mlnp, usf))
+        assert done
+        if not job.advance():
+            break
+    assert generations == 2
+    assert job.evaluations == 8
+    assert len(job.result_row()) == len(RESULT_COLUMNS)
+
+def test_finished_jobs_are_read_back(tmp_path):
+    path = tmp_path / "results.tsv"
+    path.write_text('\t'.join(RESULT_COLUMNS) + '\n' + '\t'.join(['a|seed=0'] + ['x'] * 14) + '\n'
+                    + 'truncated-row\n')
+    assert read_finished_jobs(str(path)) == {'a|seed=0'}
+
+def test_worker_caches_are_bounded(toy_arff):
+    import sweep
+    header, names, recs = parse_arff(toy_arff)
+    sweep.init_sweep_worker({"toy.arff": (header, names, recs)}, cache_size=2)
+    mask = [True] * (len(names) - 1)
+    for seed in range(5):
+        for usf in (False, True):
+            _, _, score = sweep.sweep_fitness_worker(("job", 0, "toy.arff", seed, True, usf, mask))
+            folds = make_folds(len(recs), rng=random.Random(seed))
+            assert score == evaluate_mask(header, names, recs, folds, mask, True, usf)
+    assert len(sweep._FOLDS_CACHE) == 2 and len(sweep._EVALUATORS) == 2
+    assert list(sweep._EVALUATORS) == [("toy.arff", 4, False), ("toy.arff", 4, True)]
+
+def test_dataset_key_changes_with_content(toy_arff):
+    before = dataset_key(toy_arff)
+    assert before.startswith("toy.arff@") and dataset_key(toy_arff) == before
+    with open(toy_arff, 'a') as f:
+        f.write("% re-discretized\n")
+    assert dataset_key(toy_arff) != before
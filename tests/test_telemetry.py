@@ -0,0 +1,57 @@
+import json
+import pytest
+from telemetry import Telemetry, population_diversity
+
+def test_population_diversity_bounds():
+    assert population_diversity([[True, False]] * 4) == 0.0
+    assert population_diversity([[True, True], [False, False]]) == 1.0
+
+def test_generation_record_and_prometheus(tmp_path):
+    path = tmp_path / "telemetry.jsonl"
+    with Telemetry(str(path), None, "toy.arff") as tel:
+        pop = [[True, False], [False, True]]
+        timings = [(11, 1.0, 1.5, 100), (12, 1.2, 1.4, 200)]
+        tel.record_generation(1, [50.0, 70.0], pop, timings, 1.0, 2.0, 70.0)
+        text = tel.render_prometheus()
+
+    rec = json.loads(path.read_text().splitlines()[0])
+    assert rec["evaluations"] == 2
+    assert rec["evals_per_sec"] == 2.0
+    assert rec["fitness_avg"] == 60.0
+    assert rec["worker_busy_seconds"]["11"] == 0.5
+    assert rec["queue_wait_max"] == pytest.approx(0.2)
+    assert 'mpfs_ga_fitness{dataset="toy.arff",stat="best"} 70.0' in text
+    assert 'mpfs_ga_evaluations_total{dataset="toy.arff"} 2' in text
+
+def test_stored_scores_are_not_evaluations():
+    tel = Telemetry(None, None, "toy.arff")
+    rec = tel.record_generation(1, [50.0, 70.0, 60.0], [[True]] * 3, [], 1.0, 2.0, 70.0,
+                                extra_evaluations=4, reused=5)
+    assert (rec["evaluations"], rec["reused"], tel.evaluations_total) == (2, 5, 2)
+
+@pytest.mark.parametrize("platform, scale", [("darwin", 1), ("linux", 1024)])
+def test_rss_fallback_units(monkeypatch, platform, scale):
+    import builtins
+    import resource
+    import telemetry
+
+    def no_proc(*args, **kwargs):
+        raise OSError("no /proc")
+    monkeypatch.setattr(builtins, "open", no_proc)
+    monkeypatch.setattr(telemetry.sys, "platform", platform)
+    monkeypatch.setattr(resource, "getrusage", lambda who: type("Usage", (), {"ru_maxrss": 5000})())
+    assert telemetry.process_rss_bytes() == 5000 * scale
+
+def test_metrics_url_reports_bound_port():
+    with Telemetry(None, 0, "toy.arff") as tel:
+        url = tel.metrics_url()
+        assert url.startswith("http://127.0.0.1:") and not url.endswith(":0/metrics")
+    assert Telemetry(None, None, "toy.arff").metrics_url() is None
+
+def test_busy_port_closes_the_jsonl_file(tmp_path):
+    with Telemetry(None, 0, "toy.arff") as taken:
+        port = int(taken.metrics_url().split(':')[-1].split('/')[0])
+        tel = Telemetry(str(tmp_path / "t.jsonl"), port, "toy.arff")
+        with pytest.raises(OSError):
+            tel.open()
+        assert tel._fout is None and tel.metrics_url() is None